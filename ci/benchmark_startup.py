@@ -0,0 +1,204 @@
+"""Measure the import time of mplotutils and the latency of the first (cold) and
+second (warm) call of its main functions. Every measurement runs in a fresh python
+process. The results are written as JSON and can be compared against a previous run.
+
+Usage::
+
+    python ci/benchmark_startup.py --output results.json
+    python ci/benchmark_startup.py --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+# setup code that is run (and not timed) before calling the function
+SETUP = """
+import matplotlib
+matplotlib.use("agg")
+import numpy as np
+import mplotutils as mpu
+"""
+
+SETUP_MAP = SETUP + """
+import cartopy.crs as ccrs
+import matplotlib.pyplot as plt
+f, ax = plt.subplots(subplot_kw={"projection": ccrs.PlateCarree()})
+ax.set_global()
+"""
+
+BENCHMARKS = {
+    "from_levels_and_cmap": (
+        SETUP,
+        "mpu.from_levels_and_cmap([0, 1, 2, 3, 4], 'Blues', extend='both')",
+    ),
+    "colorbar": (
+        SETUP + """
+import matplotlib.pyplot as plt
+f, ax = plt.subplots()
+h = ax.pcolormesh(np.zeros((10, 10)))
+""",
+        "mpu.colorbar(h, ax)",
+    ),
+    "set_map_layout": (SETUP_MAP, "mpu.set_map_layout(ax)"),
+    "hatch_map_global": (
+        SETUP_MAP + "da = mpu.sample_dataarray(36, 18) > 0.5",
+        "mpu.hatch_map_global(da, '//', ax=ax)",
+    ),
+    "xticklabels": (SETUP_MAP, "mpu.xticklabels([-180, 0, 180], ax=ax)"),
+}
+
+# time the first and second call of the statement
+TIMER = """
+import json, time
+{setup}
+start = time.perf_counter()
+{stmt}
+cold = time.perf_counter() - start
+start = time.perf_counter()
+{stmt}
+warm = time.perf_counter() - start
+print(json.dumps({{"cold": cold, "warm": warm}}))
+"""
+
+
+def run_python(*args):
+
+    result = subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+    return result
+
+
+def measure_import(repeat):
+    """total import time and the cumulative time per module in seconds (-X importtime)"""
+
+    totals = []
+    modules = {}
+
+    for _ in range(repeat):
+        stderr = run_python("-X", "importtime", "-c", "import mplotutils").stderr
+
+        for name, cumulative in parse_importtime(stderr):
+            modules.setdefault(name, []).append(cumulative)
+
+        totals.append(modules["mplotutils"][-1])
+
+    modules = {name: statistics.median(times) for name, times in modules.items()}
+
+    # only report top-level packages and mplotutils modules
+    modules = {
+        name: time
+        for name, time in sorted(modules.items(), key=lambda item: -item[1])
+        if "." not in name or name.startswith("mplotutils")
+    }
+
+    return {"total": statistics.median(totals), "modules": modules}
+
+
+def parse_importtime(stderr):
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+
+        # importtime reports microseconds
+        yield name.strip(), int(cumulative) / 1e6
+
+
+def measure_function(setup, stmt, repeat):
+    """median cold and warm latency in seconds"""
+
+    cold, warm = [], []
+
+    for _ in range(repeat):
+        stdout = run_python("-c", TIMER.format(setup=setup, stmt=stmt)).stdout
+        result = json.loads(stdout.splitlines()[-1])
+
+        cold.append(result["cold"])
+        warm.append(result["warm"])
+
+    return {"cold": statistics.median(cold), "warm": statistics.median(warm)}
+
+
+def versions():
+
+    code = """
+import importlib, json
+result = {}
+for name in ("mplotutils", "matplotlib", "cartopy", "xarray", "numpy"):
+    try:
+        result[name] = importlib.import_module(name).__version__
+    except ImportError:
+        result[name] = None
+print(json.dumps(result))
+"""
+
+    result = json.loads(run_python("-c", code).stdout)
+    result["python"] = platform.python_version()
+
+    return result
+
+
+def compare(results, baseline):
+
+    def row(name, new, old):
+        print(f"{name:<30} {old * 1e3:>10.2f} {new * 1e3:>10.2f} {new / old:>8.2f}x")
+
+    print(f"{'':<30} {'baseline':>10} {'current':>10} {'ratio':>9}")
+    print(f"{'(milliseconds)':<30}")
+
+    row("import mplotutils", results["import"]["total"], baseline["import"]["total"])
+
+    for name, result in results["functions"].items():
+        if name not in baseline["functions"]:
+            continue
+        for kind in ("cold", "warm"):
+            old = baseline["functions"][name][kind]
+            row(f"{name} ({kind})", result[kind], old)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare to")
+    parser.add_argument(
+        "--benchmarks",
+        nargs="*",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+        help="functions to benchmark",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "versions": versions(),
+        "repeat": args.repeat,
+        "import": measure_import(args.repeat),
+        "functions": {
+            name: measure_function(*BENCHMARKS[name], repeat=args.repeat)
+            for name in args.benchmarks
+        },
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
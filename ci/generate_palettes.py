@@ -0,0 +1,54 @@
+"""Generate the palette bank of mplotutils (mplotutils/data/palettes.npz) from seaborn.
+
+The bank contains the seaborn palettes that are not available in matplotlib, such that
+``from_levels_and_cmap`` does not need to import seaborn. Re-run the script when
+seaborn adds or changes palettes and commit the updated file.
+
+Usage::
+
+    python ci/generate_palettes.py
+"""
+
+import argparse
+import os
+
+import matplotlib as mpl
+import numpy as np
+import seaborn as sns
+from seaborn.palettes import SEABORN_PALETTES
+
+# seaborn colormaps, stored with the full resolution of the colormap
+CONTINUOUS = ("rocket", "mako", "flare", "crest", "vlag", "icefire")
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(__file__), "..", "mplotutils", "data", "palettes.npz"
+)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="file to write")
+    args = parser.parse_args()
+
+    palettes = {}
+
+    for name, colors in SEABORN_PALETTES.items():
+        palettes[name] = mpl.colors.to_rgba_array(colors)[:, :3]
+
+    for name in CONTINUOUS:
+        cmap = mpl.colormaps[name]
+        palettes[name] = cmap(np.arange(cmap.N))[:, :3]
+
+    np.savez_compressed(
+        args.output,
+        qualitative=np.array(sorted(SEABORN_PALETTES)),
+        seaborn_version=np.array(sns.__version__),
+        **palettes,
+    )
+
+    print(f"wrote {len(palettes)} palettes to {os.path.normpath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,109 @@
 # flake8: noqa
 
+import importlib
 from importlib.metadata import version as _get_version
 
-from mplotutils import _cartopy_utils, _colorbar, _colormaps
-from mplotutils._cartopy_utils import (
-    cyclic_dataarray,
-    sample_data_map,
-    sample_dataarray,
-    xlabel_map,
-    xticklabels,
-    ylabel_map,
-    yticklabels,
-)
-from mplotutils._colorbar import colorbar
-from mplotutils._colormaps import from_levels_and_cmap
-from mplotutils._hatch import hatch, hatch_map, hatch_map_global
-from mplotutils._map_layout import set_map_layout
-from mplotutils._mpl import _get_renderer
+from mplotutils import _savefig
 from mplotutils._savefig import autodraw
 
-autodraw(True)
+# the remaining functions are imported on first use (PEP 562), so `import mplotutils`
+# does not import cartopy, xarray, or pyplot
+_LAZY_ATTRS = {
+    "RenderCache": "_cache",
+    "cyclic_dataarray": "_cartopy_utils",
+    "sample_data_map": "_cartopy_utils",
+    "sample_dataarray": "_cartopy_utils",
+    "xlabel_map": "_cartopy_utils",
+    "xticklabels": "_cartopy_utils",
+    "ylabel_map": "_cartopy_utils",
+    "yticklabels": "_cartopy_utils",
+    "colorbar": "_colorbar",
+    "colorbars": "_colorbar",
+    "categorize": "_colorize",
+    "classify": "_colorize",
+    "colorize": "_colorize",
+    "detach_colorbar_layout": "_colorbar",
+    "from_classes_and_cmap": "_colormaps",
+    "from_data_and_cmap": "_levels",
+    "from_levels_and_cmap": "_colormaps",
+    "export_buffer": "_export",
+    "export_raster": "_export",
+    "savefig_async": "_export",
+    "savefig_many": "_export",
+    "hatch": "_hatch",
+    "hatch_map": "_hatch",
+    "hatch_map_global": "_hatch",
+    "rebind_colorbar": "_colorbar",
+    "robust_levels": "_levels",
+    "set_map_layout": "_map_layout",
+    "_get_renderer": "_mpl",
+}
+
+_LAZY_MODULES = {
+    "_cache",
+    "_cartopy_utils",
+    "_colorbar",
+    "_colorize",
+    "_colormaps",
+    "_export",
+    "_hatch",
+    "_levels",
+    "_map_layout",
+    "_mpl",
+}
+
+
+def __getattr__(name):
+
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f"mplotutils.{_LAZY_ATTRS[name]}")
+        attr = getattr(module, name)
+        # cache the attribute so __getattr__ is only called once
+        globals()[name] = attr
+        return attr
+
+    if name in _LAZY_MODULES:
+        # importing a submodule adds it to the namespace of the package
+        return importlib.import_module(f"mplotutils.{name}")
+
+    raise AttributeError(f"module 'mplotutils' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
+    "RenderCache",
     "_colorbar",
+    "_colorize",
     "_get_renderer",
     "autodraw",
     "_cartopy_utils",
     "colorbar",
+    "colorbars",
     "_colormaps",
+    "categorize",
+    "classify",
+    "colorize",
+    "_savefig",
     "cyclic_dataarray",
+    "detach_colorbar_layout",
+    "export_buffer",
+    "export_raster",
+    "from_classes_and_cmap",
+    "from_data_and_cmap",
     "from_levels_and_cmap",
+    "_levels",
     "hatch_map_global",
     "hatch_map",
     "hatch",
+    "rebind_colorbar",
+    "robust_levels",
     "sample_data_map",
     "sample_dataarray",
+    "savefig_async",
+    "savefig_many",
     "set_map_layout",
     "xlabel_map",
     "xticklabels",
@@ -0,0 +1,279 @@
+import contextlib
+import hashlib
+import os
+import shutil
+import tempfile
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.figure import Figure
+
+from mplotutils._daskcompat import _is_dask_collection
+
+
+class RenderCache:
+    """on-disk cache of saved figures, keyed on a hash of the figure inputs
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Directory to store the cached images in. Is created if it does not exist.
+    max_size : int, default: None
+        Maximum total size of the cache in bytes. The least recently used entries are
+        removed when it is exceeded. If None the size is not limited.
+
+    Examples
+    --------
+    >>> cache = mpu.RenderCache("~/.cache/figures", max_size=2**30)  # doctest: +SKIP
+    >>> cache.savefig(plot_map, "map.png", key=(da, cmap, norm), dpi=300)  # doctest: +SKIP
+    """
+
+    def __init__(self, directory, *, max_size=None):
+
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.stats = {"hits": 0, "misses": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def savefig(self, figure, fname, *, key, **kwargs):
+        """save a figure - or copy it from the cache if the key was already saved
+
+        Parameters
+        ----------
+        figure : Figure or callable
+            The figure to save or a callable returning the figure. A callable is only
+            called (and the returned figure closed) if the key is not in the cache.
+        fname : str or path-like
+            The file name.
+        key : object
+            All inputs that define the figure, e.g., the data arrays, colormap and
+            norm (e.g. from ``from_levels_and_cmap``), and projection. May be a
+            (nested) tuple, list or dict of arrays, xarray objects, colormaps, norms
+            (except `FuncNorm`), cartopy CRS, strings and numbers. The size and dpi
+            of a `Figure`, the file extension and ``**kwargs`` are added
+            automatically.
+        **kwargs : keyword arguments
+            Passed on to `Figure.savefig`.
+
+        Returns
+        -------
+        hit : bool
+            True if the figure was copied from the cache.
+        """
+
+        ext = os.path.splitext(fname)[1].lower()
+
+        full_key = [key, ext, kwargs, mpl.__version__]
+        if isinstance(figure, Figure):
+            full_key.append((tuple(figure.get_size_inches()), figure.dpi))
+
+        cached = os.path.join(self.directory, _hash_key(full_key) + ext)
+
+        if self._copy_cached(cached, fname):
+            self.stats["hits"] += 1
+            return True
+
+        if isinstance(figure, Figure):
+            figure.savefig(fname, **kwargs)
+        else:
+            import matplotlib.pyplot as plt
+
+            fig = figure()
+            try:
+                fig.savefig(fname, **kwargs)
+            finally:
+                plt.close(fig)
+
+        self._store(fname, cached)
+        self.stats["misses"] += 1
+
+        self.evict()
+
+        return False
+
+    def _copy_cached(self, cached, fname):
+        # another process sharing the cache may evict the entry at any time - in this
+        # case it's a miss
+
+        try:
+            shutil.copyfile(cached, fname)
+            # update the access time for the LRU eviction
+            os.utime(cached)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _store(self, fname, cached):
+        # write to a temporary file first so no partial entries are visible
+
+        fid, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fid)
+
+        try:
+            shutil.copyfile(fname, tmp)
+            os.replace(tmp, cached)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def _entries(self):
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # removed by another process
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return entries
+
+    @property
+    def size(self):
+        """total size of the cached files in bytes"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """remove the least recently used entries until the cache is small enough"""
+
+        if self.max_size is None:
+            return
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            _remove(path)
+            total -= size
+
+    def clear(self):
+        """remove all cached files"""
+
+        for _, _, path in self._entries():
+            _remove(path)
+
+
+def _remove(path):
+    # the file may already be removed by another process sharing the cache
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def _hash_key(key):
+
+    hasher = hashlib.blake2b(digest_size=20)
+    _update_hash(hasher, key)
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher, obj):
+
+    def update(tag, *parts):
+        hasher.update(tag.encode())
+        for part in parts:
+            _update_hash(hasher, part)
+
+    if obj is None or isinstance(obj, bool | int | float | complex | str):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+    elif isinstance(obj, bytes):
+        hasher.update(b"bytes:" + obj)
+
+    elif isinstance(obj, list | tuple):
+        update(f"{type(obj).__name__}:{len(obj)}", *obj)
+
+    elif isinstance(obj, dict):
+        items = sorted(obj.items(), key=lambda item: repr(item[0]))
+        update(f"dict:{len(obj)}", *(part for item in items for part in item))
+
+    elif isinstance(obj, np.ndarray | np.generic):
+        _update_hash_array(hasher, obj)
+
+    elif _is_dask_collection(obj):
+        # the dask token is deterministic and avoids computing the data
+        from dask.base import tokenize
+
+        update("dask", tokenize(obj))
+
+    elif _is_xarray(obj, "coords"):
+        if hasattr(obj, "data_vars"):
+            update("dataset", dict(obj.data_vars), dict(obj.coords))
+        else:
+            coords = {name: coord.variable for name, coord in obj.coords.items()}
+            update("dataarray", obj.name, obj.variable, coords)
+
+    elif _is_xarray(obj, "dims"):
+        # xarray.Variable - don't load dask data
+        data = obj.data if _is_dask_collection(obj.data) else obj.values
+        update("variable", obj.dims, data, obj.attrs)
+
+    elif isinstance(obj, mpl.colors.Colormap):
+        colors = obj(np.arange(obj.N))
+        extremes = [obj.get_under(), obj.get_over(), obj.get_bad()]
+        update("colormap", obj.name, colors, np.asarray(extremes))
+
+    elif isinstance(obj, mpl.colors.Normalize):
+        cls = type(obj)
+        update(f"norm:{cls.__module__}.{cls.__qualname__}", _norm_params(obj))
+
+    elif hasattr(obj, "proj4_init"):
+        # cartopy CRS
+        update(type(obj).__qualname__, obj.proj4_init, getattr(obj, "bounds", None))
+
+    else:
+        raise TypeError(f"Cannot hash object of type {type(obj)} for the cache key")
+
+
+def _norm_params(norm):
+    # all parameters of a norm, e.g. vcenter of TwoSlopeNorm or gamma of PowerNorm -
+    # raises a TypeError in _update_hash for parameters that can not be hashed (e.g.
+    # the functions of FuncNorm)
+
+    params = {
+        name: value
+        for name, value in vars(norm).items()
+        if name not in _NORM_IGNORE_ATTRS
+    }
+
+    # the transform of norms created from a scale (e.g. LogNorm or SymLogNorm)
+    trf = params.pop("_trf", None)
+    if trf is not None:
+        params["_trf"] = {
+            name: value
+            for name, value in vars(trf).items()
+            if name not in _TRANSFORM_IGNORE_ATTRS
+        }
+        params["_trf_type"] = type(trf).__qualname__
+
+    return params
+
+
+# attributes that do not affect the mapped colors - the scale of a norm is
+# described by its transform
+_NORM_IGNORE_ATTRS = {"callbacks", "_scale"}
+
+# the state of the transform tree, and functions derived from the base of LogTransform
+_TRANSFORM_IGNORE_ATTRS = {"_parents", "_invalid", "_shorthand_name", "_log_funcs"}
+
+
+def _update_hash_array(hasher, arr):
+
+    arr = np.asarray(arr)
+
+    if arr.dtype.hasobject:
+        raise TypeError("Cannot hash arrays of dtype object for the cache key")
+
+    hasher.update(f"array:{arr.dtype.str}:{arr.shape};".encode())
+    hasher.update(np.ascontiguousarray(arr).data)
+
+
+def _is_xarray(obj, attr):
+    return type(obj).__module__.startswith("xarray.") and hasattr(obj, attr)
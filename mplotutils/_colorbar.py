@@ -2,9 +2,13 @@ import warnings
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+import matplotlib.ticker as mticker
 import matplotlib.transforms as mtransforms
 import numpy as np
 
+from mplotutils._colormaps import _CategoricalNorm
+from mplotutils._mpl import _get_renderer
+
 
 def _deprecate_ax1_ax2(ax, ax2, ax1):
     if ax is None:
@@ -59,6 +63,8 @@ def colorbar(
     pad=None,
     shift="symmetric",
     shrink=None,
+    rasterized=None,
+    tick_spacing=None,
     **kwargs,
 ):
     """colorbar that adjusts to the axes height (and automatically resizes)
@@ -86,6 +92,13 @@ def colorbar(
         Fraction of the total height that the colorbar is shifted up/ right. See Note.
     shrink : None or float in 0..1, default: None.
         Fraction of the total height that the colorbar is shrunk. See Note.
+    rasterized : bool, default: None
+        Whether to draw the colors as one raster image in vector outputs (pdf, svg).
+        If None, matplotlib rasterizes colorbars with 50 or more colors.
+    tick_spacing : float, default: None
+        Minimum distance between the ticks in points. If given, the ticks are thinned
+        to fit the length of the colorbar, e.g., for colorbars with many levels. The
+        ticks stay thinned if the norm of the mappable changes.
     **kwargs : keyword arguments
         See Other Parameters.
 
@@ -226,6 +239,96 @@ def colorbar(
     """
 
     ax = _deprecate_ax1_ax2(ax, ax2, kwargs.pop("ax1", None))
+
+    parsed = _parse_colorbar(
+        ax,
+        orientation=orientation,
+        aspect=aspect,
+        size=size,
+        pad=pad,
+        shift=shift,
+        shrink=shrink,
+        rasterized=rasterized,
+        tick_spacing=tick_spacing,
+        **kwargs,
+    )
+
+    (cbar,) = _create_colorbars([mappable], [parsed])
+
+    return cbar
+
+
+def colorbars(specs, **kwargs):
+    """create several colorbars at once
+
+    Parameters
+    ----------
+    specs : iterable of dict
+        One dict per colorbar. Must contain the keys ``"mappable"`` and ``"ax"``. All
+        other keys are passed to `mplotutils.colorbar`, e.g., ``"orientation"``,
+        ``"size"``, or ``"label"``.
+    **kwargs : keyword arguments
+        Passed to `mplotutils.colorbar` for all colorbars. Keys in ``specs`` take
+        precedence.
+
+    Returns
+    -------
+    cbars : list of Colorbar
+        One colorbar per spec.
+
+    Examples
+    --------
+    >>> import matplotlib.pyplot as plt
+    >>> import mplotutils as mpu
+
+    >>> f, axs = plt.subplots(3, 2)
+    >>> hs = [ax.pcolormesh([[0, 1], [2, 3]]) for ax in axs.flat]
+
+    >>> # one colorbar per row
+    >>> specs = [{"mappable": hs[2 * i], "ax": row} for i, row in enumerate(axs)]
+    >>> cbars = mpu.colorbars(specs, size=0.05)
+
+    Notes
+    -----
+    All specs are checked before the first colorbar is created, and every parent axes
+    is positioned only once.
+
+    See Also
+    --------
+    mplotutils.colorbar
+    """
+
+    mappables, all_parsed = [], []
+
+    for spec in specs:
+        spec = kwargs | dict(spec)
+
+        if "mappable" not in spec or "ax" not in spec:
+            raise ValueError("Each spec needs a 'mappable' and an 'ax'")
+
+        mappables.append(spec.pop("mappable"))
+
+        all_parsed.append(_parse_colorbar(spec.pop("ax"), **spec))
+
+    return _create_colorbars(mappables, all_parsed)
+
+
+def _parse_colorbar(
+    ax,
+    *,
+    orientation="vertical",
+    aspect=None,
+    size=None,
+    pad=None,
+    shift="symmetric",
+    shrink=None,
+    rasterized=None,
+    tick_spacing=None,
+    **kwargs,
+):
+    # check the arguments and return the locator of the colorbar, the mplotutils
+    # options, and the remaining keyword arguments for Figure.colorbar
+
     axs = np.asarray(ax).flatten()
 
     if orientation not in ("vertical", "horizontal"):
@@ -244,160 +347,386 @@ def colorbar(
     if not all(f == ax.get_figure() for ax in axs):
         raise TypeError("All passed axes must belong to the same figure")
 
+    if tick_spacing is not None and tick_spacing <= 0:
+        raise ValueError("'tick_spacing' must be positive")
+
+    shift, shrink = _parse_shift_shrink(shift, shrink)
+
+    size, aspect, pad = _parse_size_aspect_pad(size, aspect, pad, orientation)
+
+    if orientation == "horizontal" and aspect is not None:
+        aspect = 1 / aspect
+
+    locator = _ColorbarLocator(f, axs, orientation, size, aspect, pad, shift, shrink)
+
+    options = {"rasterized": rasterized, "tick_spacing": tick_spacing}
+
+    return locator, options, kwargs
+
+
+def _create_colorbars(mappables, all_parsed):
+
+    if not mappables:
+        return []
+
     gca = plt.gca()
-    cbax = _get_cbax(f)
+
+    cbars = []
+    for mappable, (locator, options, kwargs) in zip(mappables, all_parsed):
+
+        cbax = _get_cbax(locator.f)
+
+        if locator.aspect is not None:
+            anchor = (0, 0.5) if locator.orientation == "vertical" else (0.5, 1.0)
+            cbax.set_anchor(anchor)
+            cbax.set_box_aspect(locator.aspect)
+
+        # the locator must be set before creating the colorbar, matplotlib wraps it to
+        # make room for the extends
+        cbax.set_axes_locator(locator)
+
+        if isinstance(mappable.norm, _CategoricalNorm):
+            kwargs = _categorical_colorbar_kwargs(mappable.norm, kwargs)
+
+        cbar = locator.f.colorbar(
+            mappable, orientation=locator.orientation, cax=cbax, **kwargs
+        )
+        _set_colorbar_options(cbar, **options)
+        cbars.append(cbar)
+
     # ensure mpu.colorbar does not change the current axes
     plt.sca(gca)
 
-    cbar = f.colorbar(mappable, orientation=orientation, cax=cbax, **kwargs)
-
-    if orientation == "vertical":
-        func = _resize_colorbar_vert(
-            cbax,
-            f,
-            axs,
-            aspect=aspect,
-            size=size,
-            pad=pad,
-            shift=shift,
-            shrink=shrink,
-        )
+    # set the initial positions without rendering the figure, they are updated on each
+    # draw - parents shared by several colorbars are only positioned once
+    parents = dict.fromkeys(ax for locator, *_ in all_parsed for ax in locator.axs)
+    for ax in [*parents, *(cbar.ax for cbar in cbars)]:
+        _apply_axes_locator(ax)
+
+    return cbars
+
+
+def detach_colorbar_layout(cbar):
+    """fix a colorbar created by mplotutils at its current position
+
+    Parameters
+    ----------
+    cbar : Colorbar
+        Colorbar created by `mplotutils.colorbar` or `mplotutils.colorbars`.
+
+    Notes
+    -----
+    Afterwards the colorbar no longer follows its parent axes when they move or the
+    figure is resized, and it no longer references them.
+    """
+
+    cbax = cbar.ax
+    locator = cbax.get_axes_locator()
+
+    # matplotlib wraps the locator to make room for the extends
+    mpu_locator = getattr(locator, "_orig_locator", locator)
+
+    if not isinstance(mpu_locator, _ColorbarLocator):
+        raise TypeError("'cbar' was not created by mplotutils or is already detached")
+
+    # set_position removes the axes from the layout, restore it
+    in_layout = cbax.get_in_layout()
+    cbax.set_position(mpu_locator(cbax))
+    cbax.set_in_layout(in_layout)
+
+    if locator is mpu_locator:
+        cbax.set_axes_locator(None)
     else:
-        func = _resize_colorbar_horz(
-            cbax,
-            f,
-            axs,
-            aspect=aspect,
-            size=size,
-            pad=pad,
-            shift=shift,
-            shrink=shrink,
+        locator._orig_locator = None
+
+    cbax.stale = True
+
+
+def _categorical_colorbar_kwargs(norm, kwargs):
+    # one tick per class, labeled with the class
+
+    kwargs = kwargs.copy()
+
+    if "ticks" not in kwargs:
+        kwargs["ticks"] = np.arange(len(norm.classes))
+
+    if "format" not in kwargs:
+        labels = norm.labels
+        kwargs["format"] = mticker.FuncFormatter(lambda x, pos: labels[round(x)])
+
+    return kwargs
+
+
+def _set_colorbar_options(cbar, rasterized=None, tick_spacing=None):
+
+    if rasterized is not None:
+        # n_rasterize is used when matplotlib redraws the colors
+        cbar.n_rasterize = 0 if rasterized else np.inf
+        if cbar.solids is not None:
+            cbar.solids.set_rasterized(rasterized)
+
+    if tick_spacing is not None:
+        cbar.locator = _ThinningLocator(cbar.locator, tick_spacing)
+        _keep_thinning(cbar, cbar.mappable, tick_spacing)
+
+
+def _keep_thinning(cbar, mappable, spacing):
+    # matplotlib resets the locator of the colorbar if the norm of the mappable
+    # changes - wrap the new locator again (runs after `cbar.update_normal`, which is
+    # connected first)
+
+    def rewrap(mappable):
+        if mappable.colorbar is cbar and not isinstance(cbar.locator, _ThinningLocator):
+            cbar.locator = _ThinningLocator(cbar.locator, spacing)
+
+    mappable.callbacks.connect("changed", rewrap)
+
+
+class _ThinningLocator(mticker.Locator):
+    """thin the ticks of a locator such that they are at least `spacing` points apart
+
+    The ticks are only recomputed if the view limits or the length of the axis change.
+    """
+
+    def __init__(self, locator, spacing):
+
+        self.locator = locator
+        self.spacing = spacing
+
+        self._key = None
+        self._ticks = None
+
+    def set_axis(self, axis):
+        super().set_axis(axis)
+        self.locator.set_axis(axis)
+
+    def __call__(self):
+
+        bbox = self.axis.axes.bbox
+        length = bbox.width if self.axis.axis_name == "x" else bbox.height
+        # pixel to points
+        length = length * 72 / self.axis.axes.figure.dpi
+
+        key = (tuple(self.axis.get_view_interval()), length)
+
+        if key != self._key:
+            self._key = key
+            self._ticks = self._thin(np.asarray(self.locator()), length)
+
+        return self._ticks
+
+    def tick_values(self, vmin, vmax):
+        return self.locator.tick_values(vmin, vmax)
+
+    def _thin(self, ticks, length):
+
+        max_ticks = max(int(length // self.spacing) + 1, 2)
+
+        if ticks.size <= max_ticks:
+            return ticks
+
+        step = int(np.ceil((ticks.size - 1) / (max_ticks - 1)))
+        return ticks[::step]
+
+
+def rebind_colorbar(cbar, mappable=None, *, norm=None):
+    """attach a colorbar to a new mappable and/ or norm, keeping its axes and position
+
+    Parameters
+    ----------
+    cbar : Colorbar
+        The colorbar to update, e.g., created by `mplotutils.colorbar`.
+    mappable : handle, default: None
+        The new `matplotlib.cm.ScalarMappable` described by the colorbar. The previous
+        mappable is detached from the colorbar.
+    norm : `matplotlib.colors.Normalize`, default: None
+        New norm for the mappable (and the colorbar).
+
+    Examples
+    --------
+    >>> import matplotlib.pyplot as plt
+    >>> import mplotutils as mpu
+    >>> import numpy as np
+
+    >>> f, ax = plt.subplots()
+    >>> h = ax.pcolormesh(np.zeros((2, 2)))
+    >>> cbar = mpu.colorbar(h, ax)
+
+    >>> # e.g. for each frame of an animation
+    >>> h.remove()
+    >>> h = ax.pcolormesh(np.ones((2, 2)), vmin=0, vmax=2)
+    >>> mpu.rebind_colorbar(cbar, h)
+
+    Notes
+    -----
+    Changing the data, colormap, or norm of the mappable updates the colorbar
+    automatically - `rebind_colorbar` is only required for a new mappable. The ticks
+    are reset if the type of the norm changes, the ``tick_spacing`` of
+    `mplotutils.colorbar` is kept.
+    """
+
+    if mappable is None and norm is None:
+        raise TypeError("Need to pass at least one of 'mappable' and 'norm'")
+
+    locator = cbar.locator
+    new_mappable = mappable is not None and mappable is not cbar.mappable
+
+    if not new_mappable:
+        if norm is not None:
+            # triggers the update of the colorbar
+            cbar.mappable.set_norm(norm)
+    else:
+        if norm is not None:
+            mappable.set_norm(norm)
+
+        _disconnect_colorbar(cbar.mappable)
+        _disconnect_colorbar(mappable)
+
+        mappable.colorbar = cbar
+        mappable.colorbar_cid = mappable.callbacks.connect(
+            "changed", cbar.update_normal
         )
 
-    f.canvas.mpl_connect("draw_event", func)
-    f.canvas.draw()
+        cbar.update_normal(mappable)
 
-    return cbar
+    if isinstance(locator, _ThinningLocator):
+        # the locator is reset when the norm changes
+        if cbar.locator is not locator:
+            cbar.locator = _ThinningLocator(cbar.locator, locator.spacing)
+
+        if new_mappable:
+            _keep_thinning(cbar, mappable, locator.spacing)
+
+
+def _disconnect_colorbar(mappable):
+
+    cid = getattr(mappable, "colorbar_cid", None)
+
+    if cid is not None:
+        mappable.callbacks.disconnect(cid)
+
+    mappable.colorbar = None
+    mappable.colorbar_cid = None
 
 
 # ========================================================================
 
 
 def _get_cbax(f):
-    # when using f.add_axes(rect) with the same rect twice
-    # it is the same axes, so we have to change rect
-    # slightly each time this func is called
+    # add_axes always creates a new axes, the position is set by the locator
+    return f.add_axes((0, 0, 0.1, 0.1))
 
-    n_axes = len(f.get_axes())
-    pos_incr = n_axes / 10.0
-    return f.add_axes([0, 0, 0.1, 0.1 + pos_incr])
 
+def _apply_axes_locator(ax, renderer=None):
+    # position the axes as done at the start of Axes.draw (without rendering)
 
-def _resize_colorbar_vert(
-    cbax,
-    f,
-    axs,
-    aspect=None,
-    size=None,
-    pad=None,
-    shift="symmetric",
-    shrink=None,
-):
+    locator = ax.get_axes_locator()
 
-    shift, shrink = _parse_shift_shrink(shift, shrink)
+    if locator is None:
+        ax.apply_aspect()
+        return
 
-    size, aspect, pad = _parse_size_aspect_pad(size, aspect, pad, "vertical")
+    # e.g. the locators of an AxesGrid need a renderer (but don't draw anything)
+    if renderer is None:
+        renderer = _get_renderer(ax.figure.figure)
 
-    if aspect is not None:
-        anchor = (0, 0.5)
-        cbax.set_anchor(anchor)
-        cbax.set_box_aspect(aspect)
+    ax.apply_aspect(locator(ax, renderer))
 
-    # inner function is called by event handler
-    def inner(event=None):
 
-        # from mpl.colorbar (but not using ax.get_position(original=True).frozen())
-        parents_bbox = mtransforms.Bbox.union([ax.get_position() for ax in axs])
+class _ColorbarLocator:
+    """axes locator positioning a colorbar next to its parent axes
 
-        # determine total height of all axes
-        full_height = parents_bbox.height
+    The position is computed whenever the colorbar axes is drawn (i.e. after the
+    parent axes have applied their aspect ratio but before the colorbar is rendered),
+    so a single draw is enough to lay out the figure. Positions are in the coordinates
+    of the (sub)figure of the parent axes.
+    """
 
-        pad_scaled = pad * parents_bbox.width
+    def __init__(self, f, axs, orientation, size, aspect, pad, shift, shrink):
 
-        # calculate position of cbax
-        left = parents_bbox.x1 + pad_scaled
+        self.f = f
+        self.axs = list(axs)
+        self.orientation = orientation
+        self.size = size
+        self.aspect = aspect
+        self.pad = pad
+        self.shift = shift
+        self.shrink = shrink
 
-        bottom = parents_bbox.y0 + shift * full_height
+        # the position is only recomputed if the parents or the figure size changed
+        self._key = None
+        self._bbox = None
 
-        height = (1 - shrink) * full_height
+    def __call__(self, cbax, renderer=None):
 
-        if aspect is None:
-            size_scaled = size * parents_bbox.width
-            width = size_scaled
-        else:
-            figure_aspect = np.divide(*f.get_size_inches())
-            width = height / (aspect * figure_aspect)
+        parents = []
+        for ax in self.axs:
+            # axes with a locator (e.g. from an AxesGrid) are only positioned on draw
+            if ax.get_axes_locator() is not None:
+                _apply_axes_locator(ax, renderer)
+
+            # from mpl.colorbar (but not using ax.get_position(original=True).frozen())
+            parents.append(ax.get_position())
 
-        pos = [left, bottom, width, height]
+        key = (tuple(parent.bounds for parent in parents), tuple(self.f.bbox.size))
 
-        cbax.set_position(pos)
+        if key == self._key:
+            return self._bbox
 
-    return inner
+        parents_bbox = mtransforms.Bbox.union(parents)
 
+        if self.orientation == "vertical":
+            pos = self._position_vert(parents_bbox)
+        else:
+            pos = self._position_horz(parents_bbox)
 
-# ====================================
+        self._key = key
+        self._bbox = mtransforms.Bbox.from_bounds(*pos).frozen()
 
+        return self._bbox
 
-def _resize_colorbar_horz(
-    cbax,
-    f,
-    axs,
-    aspect=None,
-    size=None,
-    pad=None,
-    shift="symmetric",
-    shrink=None,
-):
+    def _position_vert(self, parents_bbox):
 
-    shift, shrink = _parse_shift_shrink(shift, shrink)
+        # determine total height of all axes
+        full_height = parents_bbox.height
 
-    size, aspect, pad = _parse_size_aspect_pad(size, aspect, pad, "horizontal")
+        pad_scaled = self.pad * parents_bbox.width
 
-    if aspect is not None:
-        aspect = 1 / aspect
-        anchor = (0.5, 1.0)
-        cbax.set_anchor(anchor)
-        cbax.set_box_aspect(aspect)
+        # calculate position of cbax
+        left = parents_bbox.x1 + pad_scaled
+
+        bottom = parents_bbox.y0 + self.shift * full_height
 
-    def inner(event=None):
+        height = (1 - self.shrink) * full_height
+
+        if self.aspect is None:
+            size_scaled = self.size * parents_bbox.width
+            width = size_scaled
+        else:
+            figure_aspect = self.f.bbox.width / self.f.bbox.height
+            width = height / (self.aspect * figure_aspect)
 
-        # from mpl.colorbar (but not using ax.get_position(original=True).frozen())
-        parents_bbox = mtransforms.Bbox.union([ax.get_position() for ax in axs])
+        return [left, bottom, width, height]
+
+    def _position_horz(self, parents_bbox):
 
         full_width = parents_bbox.width
 
-        pad_scaled = pad * parents_bbox.height
+        pad_scaled = self.pad * parents_bbox.height
 
-        width = (1 - shrink) * full_width
+        width = (1 - self.shrink) * full_width
 
-        if aspect is None:
-            size_scaled = size * parents_bbox.height
+        if self.aspect is None:
+            size_scaled = self.size * parents_bbox.height
             height = size_scaled
         else:
-            figure_aspect = np.divide(*f.get_size_inches())
-            height = width * (aspect * figure_aspect)
+            figure_aspect = self.f.bbox.width / self.f.bbox.height
+            height = width * (self.aspect * figure_aspect)
 
-        left = parents_bbox.x0 + shift * full_width
+        left = parents_bbox.x0 + self.shift * full_width
         bottom = parents_bbox.y0 - (pad_scaled + height)
 
-        pos = [left, bottom, width, height]
-
-        cbax.set_position(pos)
-
-    return inner
-
-
-# ====================================
+        return [left, bottom, width, height]
 
 
 def _parse_shift_shrink(shift, shrink):
@@ -0,0 +1,233 @@
+import numpy as np
+import xarray as xr
+
+from mplotutils._colormaps import _CategoricalColormap
+
+
+def classify(data, levels):
+    """assign data to the classes defined by levels, as the norm of from_levels_and_cmap
+
+    Parameters
+    ----------
+    data : array_like or xr.DataArray
+        The data to classify. DataArrays backed by dask are classified lazily, chunk
+        by chunk.
+    levels : sequence of numbers
+        The increasing class boundaries, as passed to `from_levels_and_cmap`.
+
+    Returns
+    -------
+    indices : ndarray or xr.DataArray of uint8 or uint16
+        The class of each value, using the smallest possible dtype:
+
+        - ``0``: values below ``levels[0]``
+        - ``i + 1``: values ``v`` with ``levels[i] <= v < levels[i + 1]``
+        - ``len(levels)``: values equal to or above ``levels[-1]``
+        - ``len(levels) + 1``: NaN or masked values
+
+    See Also
+    --------
+    mplotutils.colorize
+    """
+
+    levels = _parse_levels(levels)
+    dtype = _index_dtype(levels)
+
+    if isinstance(data, xr.DataArray):
+        return xr.apply_ufunc(
+            _classify,
+            data,
+            kwargs={"levels": levels, "dtype": dtype},
+            dask="parallelized",
+            output_dtypes=[dtype],
+            keep_attrs=False,
+        )
+
+    return _classify(data, levels, dtype)
+
+
+def categorize(data, classes):
+    """convert categorical data to class indices, for from_classes_and_cmap
+
+    Parameters
+    ----------
+    data : array_like or xr.DataArray
+        The categorical data, e.g., integer land-cover codes. DataArrays backed by
+        dask are converted lazily, chunk by chunk.
+    classes : sequence of numbers
+        The values of the classes, as passed to `from_classes_and_cmap`.
+
+    Returns
+    -------
+    indices : ndarray or xr.DataArray of uint8 or uint16
+        The index of the class of each value, using the smallest possible dtype.
+        Values that are not in ``classes`` (incl. NaN) get the index
+        ``len(classes)``.
+
+    See Also
+    --------
+    mplotutils.from_classes_and_cmap, mplotutils.colorize
+    """
+
+    if np.isscalar(classes):
+        raise ValueError("'classes' must be a list of classes")
+
+    classes = np.asarray(classes)
+
+    if classes.ndim != 1 or not classes.size:
+        raise ValueError("Need at least one class")
+
+    if np.unique(classes).size != classes.size:
+        raise ValueError("'classes' must be unique")
+
+    dtype = np.min_scalar_type(classes.size)
+
+    if isinstance(data, xr.DataArray):
+        return xr.apply_ufunc(
+            _categorize,
+            data,
+            kwargs={"classes": classes, "dtype": dtype},
+            dask="parallelized",
+            output_dtypes=[dtype],
+            keep_attrs=False,
+        )
+
+    return _categorize(data, classes, dtype)
+
+
+def colorize(indices, cmap):
+    """convert class indices to RGBA colors
+
+    Parameters
+    ----------
+    indices : array_like or xr.DataArray of int
+        Class indices as returned by `classify` or `categorize`. DataArrays backed by
+        dask are converted lazily, chunk by chunk.
+    cmap : Colormap
+        Colormap with one color per class, e.g., from `from_levels_and_cmap` with the
+        same levels. Its under, over, and bad colors are used for the values below,
+        above the levels, and for missing values, respectively. For the colormap of
+        `from_classes_and_cmap` the indices of `categorize` are used, i.e., values
+        that are not a class get the (transparent) over color.
+
+    Returns
+    -------
+    rgba : ndarray or xr.DataArray of uint8
+        The colors with an additional last dimension of size 4 (named "rgba" for a
+        DataArray), which can be passed directly to ``imshow``.
+
+    Examples
+    --------
+    >>> import matplotlib.pyplot as plt
+    >>> import mplotutils as mpu
+
+    >>> da = mpu.sample_dataarray(36, 18)
+    >>> levels = [-1, -0.5, 0, 0.5, 1]
+    >>> cmap, norm = mpu.from_levels_and_cmap(levels, "RdBu_r", extend="both")
+
+    >>> rgba = mpu.colorize(mpu.classify(da, levels), cmap)
+    >>> rgba.shape
+    (18, 36, 4)
+
+    See Also
+    --------
+    mplotutils.classify
+    """
+
+    lut = _rgba_lut(cmap)
+
+    if isinstance(indices, xr.DataArray):
+        return xr.apply_ufunc(
+            _colorize,
+            indices,
+            kwargs={"lut": lut},
+            output_core_dims=[["rgba"]],
+            dask="parallelized",
+            output_dtypes=[np.uint8],
+            dask_gufunc_kwargs={"output_sizes": {"rgba": 4}},
+            keep_attrs=False,
+        )
+
+    return _colorize(indices, lut)
+
+
+def _parse_levels(levels):
+
+    if np.isscalar(levels):
+        raise ValueError("'levels' must be a list of levels")
+
+    levels = np.asarray(levels, dtype=float)
+
+    if levels.ndim != 1 or levels.size < 2:
+        raise ValueError("Need at least two 'levels'")
+
+    if np.any(np.diff(levels) <= 0):
+        raise ValueError("'levels' must be monotonically increasing")
+
+    return levels
+
+
+def _index_dtype(levels):
+    # the largest index is used for missing values
+    return np.min_scalar_type(levels.size + 1)
+
+
+def _classify(data, levels, dtype):
+
+    mask = np.ma.getmaskarray(data) if np.ma.isMaskedArray(data) else None
+    data = np.ma.getdata(data)
+
+    # side="right": levels[i] <= v < levels[i + 1] is assigned to i + 1, NaN is sorted
+    # to the end
+    indices = np.searchsorted(levels, data, side="right")
+    # searchsorted returns a scalar for scalar data
+    indices = np.asarray(indices).astype(dtype, copy=False)
+
+    missing = np.isnan(data) if mask is None else np.isnan(data) | mask
+    indices[missing] = levels.size + 1
+
+    return indices
+
+
+def _categorize(data, classes, dtype):
+
+    data = np.asarray(data)
+
+    # search in the sorted classes - compares the values without converting them
+    sorter = np.argsort(classes)
+    sorted_classes = classes[sorter]
+
+    pos = np.searchsorted(sorted_classes, data)
+    pos = np.minimum(pos, classes.size - 1)
+
+    found = sorted_classes[pos] == data
+
+    indices = np.full(data.shape, classes.size, dtype=dtype)
+    indices[found] = sorter[pos[found]]
+
+    return indices
+
+
+def _rgba_lut(cmap):
+
+    if isinstance(cmap, _CategoricalColormap):
+        # same order as the indices of categorize
+        colors = np.vstack([cmap(np.arange(cmap.N)), cmap.get_over()])
+    else:
+        # same order as the indices of classify
+        colors = np.vstack(
+            [cmap.get_under(), cmap(np.arange(cmap.N)), cmap.get_over(), cmap.get_bad()]
+        )
+
+    # same conversion as Colormap.__call__(..., bytes=True)
+    return (colors * 255).astype(np.uint8)
+
+
+def _colorize(indices, lut):
+
+    indices = np.asarray(indices)
+
+    if indices.size and (indices.min() < 0 or indices.max() >= len(lut)):
+        raise ValueError(f"'indices' must be in 0..{len(lut) - 1} for this colormap")
+
+    return lut[indices]
@@ -1,9 +1,17 @@
+import functools
+import importlib.resources
 import itertools
 
 import matplotlib as mpl
 import numpy as np
 from matplotlib.colors import from_levels_and_colors
 
+# number of color palettes kept by from_levels_and_cmap
+_PALETTE_CACHE_SIZE = 128
+
+# seaborn palettes that are not available in matplotlib, see ci/generate_palettes.py
+_PALETTE_BANK = "palettes.npz"
+
 
 def from_levels_and_cmap(levels, cmap, extend="neither"):
     """
@@ -25,6 +33,11 @@ def from_levels_and_cmap(levels, cmap, extend="neither"):
     -----
     Adapted from xarray.
 
+    The colors for a named colormap or list of colors are cached, the colormap and
+    norm are newly created for each call. Use ``from_levels_and_cmap.cache_info()``
+    to get the cache statistics and ``from_levels_and_cmap.cache_clear()`` to clear
+    it.
+
     """
     if np.isscalar(levels):
         raise ValueError("'levels' must be a list of levels")
@@ -46,12 +59,127 @@ def from_levels_and_cmap(levels, cmap, extend="neither"):
     return cmap, norm
 
 
+def from_classes_and_cmap(classes, cmap, *, labels=None):
+    """create mpl colormap and norm for categorical (class) data
+
+    Parameters
+    ----------
+    classes : sequence of numbers
+        The values of the classes, e.g., the codes of land-cover types.
+    cmap : string
+        Valid colormap identifier, see `from_levels_and_cmap`.
+    labels : sequence of str, default: None
+        Colorbar labels of the classes. If None the class values are used.
+
+    Returns
+    -------
+    cmap : ListedColormap
+        Colormap with one color per class.
+    norm : NoNorm
+        Norm using the data as index into the colormap, i.e., the data must be
+        converted to class indices with `mplotutils.categorize`.
+
+    Examples
+    --------
+    >>> import matplotlib.pyplot as plt
+    >>> import mplotutils as mpu
+    >>> import numpy as np
+
+    >>> data = np.array([[10, 20], [20, 90]])
+    >>> classes = [10, 20, 90]
+
+    >>> cmap, norm = mpu.from_classes_and_cmap(classes, "tab10")
+    >>> indices = mpu.categorize(data, classes)
+
+    >>> f, ax = plt.subplots()
+    >>> h = ax.pcolormesh(indices, cmap=cmap, norm=norm)
+    >>> cbar = mpu.colorbar(h, ax)
+
+    Notes
+    -----
+    The norm does not convert the data to float and `mplotutils.colorbar` adds one
+    tick per class. Values that are not in ``classes`` are transparent. The indices
+    can also be converted to RGBA colors directly with `mplotutils.colorize`.
+    """
+
+    if np.isscalar(classes):
+        raise ValueError("'classes' must be a list of classes")
+
+    classes = list(classes)
+
+    if labels is None:
+        labels = [str(cls) for cls in classes]
+    elif len(labels) != len(classes):
+        raise ValueError(
+            f"Need one label per class, got {len(labels)} labels and "
+            f"{len(classes)} classes"
+        )
+
+    pal = _color_palette(cmap, len(classes))
+
+    # values that are not a class (or outside the colormap) are transparent
+    cmap = _CategoricalColormap(pal)
+    cmap = cmap.with_extremes(under=(0, 0, 0, 0), over=(0, 0, 0, 0))
+
+    return cmap, _CategoricalNorm(classes, labels)
+
+
+class _CategoricalColormap(mpl.colors.ListedColormap):
+    """ListedColormap indexed by the class indices of categorize, e.g. for colorize"""
+
+
+class _CategoricalNorm(mpl.colors.NoNorm):
+    """NoNorm which knows the classes and their labels, e.g. for the colorbar"""
+
+    def __init__(self, classes, labels):
+
+        super().__init__(vmin=-0.5, vmax=len(classes) - 0.5)
+
+        self.classes = classes
+        self.labels = labels
+
+
 def _color_palette(cmap, n_colors):
-    # _color_palette is adapted from xarray:
+
+    key = _palette_key(cmap)
+
+    # colormap objects are mutable and not cached
+    if key is None:
+        return _compute_color_palette(cmap, n_colors)
+
+    return _cached_color_palette(key, n_colors)
+
+
+def _palette_key(cmap):
+    # hashable form of cmap, or None if it can not be cached
+
+    if isinstance(cmap, str):
+        return cmap
+
+    if isinstance(cmap, list | tuple):
+        try:
+            return tuple(map(tuple, mpl.colors.to_rgba_array(cmap)))
+        except ValueError:
+            return None
+
+    return None
+
+
+@functools.lru_cache(maxsize=_PALETTE_CACHE_SIZE)
+def _cached_color_palette(cmap, n_colors):
+
+    pal = np.asarray(_compute_color_palette(cmap, n_colors))
+    # the palette is shared between all cache hits
+    pal.setflags(write=False)
+
+    return pal
+
+
+def _compute_color_palette(cmap, n_colors):
+    # _compute_color_palette is adapted from xarray:
     # https://github.com/pydata/xarray/blob/v0.10.2/xarray/plot/utils.py#L110
     # Used under the terms of xarrays's license, see licenses/XARRAY_LICENSE.
 
-    import matplotlib.pyplot as plt
     from matplotlib.colors import ListedColormap
 
     colors_i = np.linspace(0, 1.0, n_colors)
@@ -64,10 +192,18 @@ def _color_palette(cmap, n_colors):
         # we have some sort of named palette
         try:
             # is this a matplotlib cmap?
-            cmap = plt.get_cmap(cmap)
-            pal = cmap(colors_i)
-        except ValueError:
-            # ValueError happens when mpl doesn't like a colormap, try seaborn
+            pal = mpl.colormaps[cmap](colors_i)
+        except KeyError:
+            # KeyError happens when mpl doesn't know a colormap, try the seaborn
+            # palettes shipped with mplotutils - avoids importing seaborn
+            pal = _bank_palette(cmap, n_colors)
+
+        if pal is None and mpl.colors.is_color_like(cmap):
+            # a single color as a string - no need to try seaborn
+            pal = ListedColormap([cmap] * n_colors)(colors_i)
+
+        if pal is None:
+            # try seaborn
             try:
                 from seaborn import color_palette
 
@@ -83,6 +219,51 @@ def _color_palette(cmap, n_colors):
     return pal
 
 
+@functools.cache
+def _palette_bank():
+    # load the palettes once, on first use
+
+    files = importlib.resources.files("mplotutils") / "data"
+
+    with (files / _PALETTE_BANK).open("rb") as fid, np.load(fid) as bank:
+        palettes = {name: bank[name] for name in bank.files}
+
+    qualitative = set(palettes.pop("qualitative").tolist())
+    palettes.pop("seaborn_version")
+
+    return palettes, qualitative
+
+
+def _bank_palette(name, n_colors):
+    # same colors as seaborn.color_palette(name, n_colors), or None if not in the bank
+
+    palettes, qualitative = _palette_bank()
+
+    reverse = name.endswith("_r") and name not in palettes
+    base = name.removesuffix("_r") if reverse else name
+
+    # seaborn has no reversed qualitative palettes
+    if base not in palettes or (reverse and base in qualitative):
+        return None
+
+    colors = palettes[base]
+
+    if base in qualitative:
+        # seaborn cycles the colors
+        return np.resize(colors, (n_colors, colors.shape[1]))
+
+    if reverse:
+        colors = colors[::-1]
+
+    # seaborn does not use the colors at the ends of a colormap
+    bins = np.linspace(0, 1, n_colors + 2)[1:-1]
+    return mpl.colors.ListedColormap(colors)(bins)[:, :3]
+
+
+from_levels_and_cmap.cache_info = _cached_color_palette.cache_info
+from_levels_and_cmap.cache_clear = _cached_color_palette.cache_clear
+
+
 def _get_label_attr(labelpad, size, weight):
     if labelpad is None:
         labelpad = mpl.rcParams["axes.labelpad"]
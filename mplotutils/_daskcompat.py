@@ -0,0 +1,3 @@
+def _is_dask_collection(obj):
+    # does not import dask
+    return hasattr(obj, "__dask_graph__") and obj.__dask_graph__() is not None
@@ -0,0 +1,358 @@
+import concurrent.futures
+import contextlib
+import io
+import os
+import threading
+import time
+
+import numpy as np
+from matplotlib import cbook
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# image formats that can not store an alpha channel
+_FORMATS_NO_ALPHA = {"JPEG", "BMP", "PPM"}
+
+# background writer for savefig_async - the number of rendered buffers waiting to be
+# encoded is limited to bound the memory use
+_WRITER_MAX_WORKERS = 2
+_WRITER_MAX_PENDING = 8
+_WRITER_PENDING = threading.BoundedSemaphore(_WRITER_MAX_PENDING)
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+
+def savefig_many(figures, fnames, *, processes=None, **kwargs):
+    """save many figures, building and rendering them in parallel worker processes
+
+    Parameters
+    ----------
+    figures : iterable of Figure or callable
+        The figures to save. Callables must return a `Figure` and are called in a
+        worker process, where the figure is created, saved and closed. They have to be
+        picklable, i.e., module-level functions or `functools.partial` thereof.
+        `Figure` instances are saved in the calling process.
+    fnames : iterable of str or path-like
+        The file names, one per figure.
+    processes : int, default: None
+        Number of worker processes. If None uses the number of CPUs.
+    **kwargs : keyword arguments
+        Passed on to `Figure.savefig`.
+
+    Returns
+    -------
+    timings : list of dict
+        Per file timings in seconds, with the keys ``"fname"``, ``"build"`` (time to
+        call the figure factory) and ``"save"`` (time to save the figure).
+
+    Notes
+    -----
+    The worker processes import matplotlib (using the Agg backend), cartopy (if
+    available) and mplotutils once when they are started.
+    """
+
+    figures = list(figures)
+    fnames = list(fnames)
+
+    if len(figures) != len(fnames):
+        raise ValueError(
+            f"Need as many 'fnames' as 'figures', got {len(fnames)} and {len(figures)}"
+        )
+
+    if not all(isinstance(fig, Figure) or callable(fig) for fig in figures):
+        raise TypeError("'figures' must be Figure instances or callables")
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    timings = [None] * len(figures)
+    factories = [i for i, fig in enumerate(figures) if not isinstance(fig, Figure)]
+
+    executor = None
+    futures = {}
+
+    if factories:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(processes, len(factories)), initializer=_init_worker
+        )
+
+    try:
+        for i in factories:
+            future = executor.submit(_build_and_save, figures[i], fnames[i], kwargs)
+            futures[future] = i
+
+        # save the figure instances while the workers are busy
+        for i, fig in enumerate(figures):
+            if isinstance(fig, Figure):
+                timings[i] = _timed_savefig(fig, fnames[i], kwargs)
+
+        for future in concurrent.futures.as_completed(futures):
+            timings[futures[future]] = future.result()
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return timings
+
+
+def _init_worker():
+    # import the heavy dependencies once per worker process
+
+    import matplotlib
+
+    matplotlib.use("agg")
+
+    import matplotlib.pyplot  # noqa: F401
+
+    try:
+        import cartopy.crs  # noqa: F401
+    except ImportError:  # pragma: no cover
+        pass
+
+    import mplotutils  # noqa: F401
+
+
+def _build_and_save(factory, fname, kwargs):
+
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig = factory()
+    build = time.perf_counter() - start
+
+    if not isinstance(fig, Figure):
+        plt.close("all")
+        raise TypeError(f"Figure factory must return a Figure, got {type(fig)}")
+
+    try:
+        return _timed_savefig(fig, fname, kwargs, build=build)
+    finally:
+        plt.close(fig)
+
+
+def _timed_savefig(fig, fname, kwargs, build=0.0):
+
+    start = time.perf_counter()
+    fig.savefig(fname, **kwargs)
+    save = time.perf_counter() - start
+
+    return {"fname": fname, "build": build, "save": save}
+
+
+def export_raster(fig, outputs, *, dpi=None):
+    """render a figure once and save it to several raster images
+
+    Parameters
+    ----------
+    fig : Figure
+        The figure to export.
+    outputs : iterable of dict
+        One dict per file. Must contain the key ``"fname"``. Optional keys:
+
+        - ``"format"``: image format, e.g. ``"png"`` or ``"jpeg"``. If not given it's
+          inferred from the file name.
+        - ``"crop"``: ``(left, upper, right, lower)`` box in pixels of the rendered
+          figure (before resizing).
+        - ``"size"``: ``(width, height)`` of the image in pixels.
+        - ``"scale"``: factor to resize the image. Mutually exclusive with ``"size"``.
+
+        All other keys are passed to `PIL.Image.Image.save`, e.g., ``"quality"``.
+    dpi : float, default: None
+        Resolution of the rendered figure. If None uses the dpi of the figure.
+
+    Notes
+    -----
+    The figure is drawn once and all images are created from the same RGBA buffer.
+    The figure is rendered with its own face color, i.e., the ``savefig.*`` rcParams are not used.
+    """
+
+    from PIL import Image
+
+    outputs = [dict(output) for output in outputs]
+
+    for output in outputs:
+        if "fname" not in output:
+            raise ValueError("Each output needs a 'fname'")
+        if "size" in output and "scale" in output:
+            raise ValueError("Can only pass one of 'size' and 'scale'")
+
+    with _render_rgba(fig, dpi=dpi) as rgba:
+
+        full_image = Image.fromarray(rgba)
+
+        for output in outputs:
+            _save_raster(full_image, **output)
+
+
+def export_buffer(fig, *, format="rgba", dpi=None, **kwargs):
+    """render a figure in memory, without temporary files
+
+    Parameters
+    ----------
+    fig : Figure
+        The figure to render.
+    format : str, default: "rgba"
+        If "rgba" returns the rendered canvas, else the image format to encode the
+        canvas with, e.g. "png".
+    dpi : float, default: None
+        Resolution of the rendered figure. If None uses the dpi of the figure.
+    **kwargs : keyword arguments
+        Passed on to the image writer, see the keys of ``outputs`` in
+        `mplotutils.export_raster`, e.g. ``size``. Not supported for "rgba".
+
+    Returns
+    -------
+    buffer : numpy.ndarray or memoryview
+        For "rgba" a ``(height, width, 4)`` uint8 array, else a memoryview of the
+        encoded image.
+
+    Notes
+    -----
+    No data is copied: the "rgba" array is a view of the buffer of the canvas and is
+    overwritten when the figure is drawn again - copy it if it needs to outlive the
+    next draw. The encoded image is a view of the underlying `io.BytesIO` buffer.
+    """
+
+    is_rgba = format.lower() == "rgba"
+
+    # check before rendering the figure
+    if is_rgba and kwargs:
+        raise TypeError("Cannot pass keyword arguments for format='rgba'")
+
+    with _render_rgba(fig, dpi=dpi) as rgba:
+
+        if is_rgba:
+            return rgba
+
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        _save_raster(Image.fromarray(rgba), buffer, format=format, **kwargs)
+
+    return buffer.getbuffer()
+
+
+def savefig_async(fig, fname, *, dpi=None, **kwargs):
+    """render a figure and encode and write the image in a background thread
+
+    Parameters
+    ----------
+    fig : Figure
+        The figure to save.
+    fname : str or path-like
+        The file name.
+    dpi : float, default: None
+        Resolution of the rendered figure. If None uses the dpi of the figure.
+    **kwargs : keyword arguments
+        Passed on to the image writer, see the keys of ``outputs`` in
+        `mplotutils.export_raster`, e.g. ``format`` or ``size``.
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+        Completes when the file is written.
+
+    Notes
+    -----
+    The figure is rendered in the calling thread and a copy of the RGBA buffer is
+    handed to the writer. Therefore, the figure can be modified or closed as soon as
+    the function returns. If too many images are waiting to be written, the function
+    blocks until one of them is done.
+    """
+
+    from PIL import Image
+
+    pending = _WRITER_PENDING
+
+    # blocks if too many buffers are waiting to be written
+    pending.acquire()
+
+    try:
+        with _render_rgba(fig, dpi=dpi) as rgba:
+            image = Image.fromarray(rgba.copy())
+
+        future = _get_writer().submit(_save_raster, image, fname, **kwargs)
+    except BaseException:
+        pending.release()
+        raise
+
+    future.add_done_callback(lambda _: pending.release())
+
+    return future
+
+
+def _get_writer():
+
+    global _WRITER
+
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_WRITER_MAX_WORKERS, thread_name_prefix="mplotutils-writer"
+            )
+
+    return _WRITER
+
+
+def _save_raster(image, fname, format=None, crop=None, size=None, scale=None, **kwargs):
+
+    from PIL import Image
+
+    if format is None:
+        ext = os.path.splitext(fname)[1].lower()
+        format = Image.registered_extensions().get(ext)
+
+        if format is None:
+            raise ValueError(f"Cannot infer the image format from {fname!r}")
+
+    format = format.upper()
+    format = "JPEG" if format == "JPG" else format
+
+    if crop is not None:
+        image = image.crop(crop)
+
+    if scale is not None:
+        size = (round(image.width * scale), round(image.height * scale))
+
+    if size is not None and tuple(size) != image.size:
+        image = image.resize(size, Image.LANCZOS)
+
+    if format in _FORMATS_NO_ALPHA:
+        # composite on white as these formats don't support transparency
+        background = Image.new("RGBA", image.size, "white")
+        image = Image.alpha_composite(background, image).convert("RGB")
+
+    image.save(fname, format=format, **kwargs)
+
+
+@contextlib.contextmanager
+def _render_rgba(fig, dpi=None):
+    # draw the figure with Agg and yield its RGBA buffer as (height, width, 4) array
+
+    # NOTE: temporarily switch to an Agg canvas (as savefig does), the layout
+    # callbacks are stored on the figure and are therefore not lost
+    orig_canvas = fig.canvas
+
+    canvas = orig_canvas
+    if not isinstance(canvas, FigureCanvasAgg):
+        canvas = FigureCanvasAgg(fig)
+
+    # as savefig: render with the dpi of the figure, not scaled for hi-dpi screens
+    if dpi is None:
+        dpi = fig._original_dpi
+
+    try:
+        with contextlib.ExitStack() as stack:
+            # as print_figure - without the manager changing the dpi does not resize
+            # the window of interactive (e.g. QtAgg or TkAgg) canvases
+            stack.enter_context(cbook._setattr_cm(orig_canvas, manager=None))
+            stack.enter_context(cbook._setattr_cm(canvas, _device_pixel_ratio=1))
+            stack.enter_context(cbook._setattr_cm(fig, dpi=dpi))
+
+            canvas.draw()
+
+            yield np.asarray(canvas.buffer_rgba())
+    finally:
+        if canvas is not orig_canvas:
+            fig.set_canvas(orig_canvas)
@@ -1,4 +1,5 @@
 import warnings
+import weakref
 
 import cartopy.crs as ccrs
 import matplotlib as mpl
@@ -8,7 +9,8 @@ from packaging.version import Version
 
 import mplotutils as mpu
 
-_HATCHES_PER_FIGURE = {}
+# weak keys, so closed figures can be garbage collected
+_HATCHES_PER_FIGURE = weakref.WeakKeyDictionary()
 
 
 from mplotutils._mpl import _maybe_gca
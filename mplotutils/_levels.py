@@ -0,0 +1,287 @@
+import matplotlib as mpl
+import numpy as np
+import xarray as xr
+
+from mplotutils._colormaps import from_levels_and_cmap
+from mplotutils._daskcompat import _is_dask_collection
+
+# number of points in the quantile sketch of robust_levels - the rank error of the
+# estimated percentiles is of the order of (depth of the merge tree) / _SKETCH_SIZE
+_SKETCH_SIZE = 2048
+
+# number of sketches merged at once
+_SKETCH_SPLIT_EVERY = 8
+
+
+def robust_levels(data, n=10, *, percentiles=(2, 98), nice=True):
+    """levels spanning the robust range of the data, e.g. for from_levels_and_cmap
+
+    Parameters
+    ----------
+    data : array_like or xr.DataArray
+        The data. For dask-backed data (e.g. a DataArray opened from zarr or netCDF
+        with chunks) the percentiles are estimated in one pass over the chunks, so the
+        data is never fully loaded into memory.
+    n : int, default: 10
+        Approximate number of levels.
+    percentiles : tuple of float, default: (2, 98)
+        Lower and upper percentile of the data spanned by the levels.
+    nice : bool, default: True
+        If True rounds the levels to "nice" numbers (using
+        `matplotlib.ticker.MaxNLocator`), which may slightly extend the range. Else
+        ``n`` equally-spaced levels between the percentiles are returned.
+
+    Returns
+    -------
+    levels : ndarray
+        The levels.
+
+    Examples
+    --------
+    >>> import mplotutils as mpu
+    >>> da = mpu.sample_dataarray(36, 18)
+    >>> levels = mpu.robust_levels(da, n=6)
+    >>> cmap, norm = mpu.from_levels_and_cmap(levels, "Reds", extend="both")
+
+    Notes
+    -----
+    For dask-backed data each chunk is summarized by a quantile sketch of fixed size.
+    The sketches are merged in a tree reduction, so the memory use is bounded by the
+    size of the chunks. The percentiles are estimated with an error of well below
+    one percentile rank. NaN values are ignored.
+    """
+
+    vmin, vmax = _robust_range(data, percentiles)
+
+    return _levels_from_range(vmin, vmax, n, nice)
+
+
+def from_data_and_cmap(data, cmap, n=10, *, percentiles=None, nice=True):
+    """colormap and norm with levels computed from the data, e.g. shared by many panels
+
+    Parameters
+    ----------
+    data : xr.DataArray, array_like, or list thereof
+        The data of all panels, e.g., a list of DataArrays or one DataArray with the
+        panels stacked along a dimension.
+    cmap : string
+        Valid colormap identifier, see `from_levels_and_cmap`.
+    n : int, default: 10
+        Approximate number of levels.
+    percentiles : tuple of float, default: None
+        If None the levels span the full range of the data, else the range between
+        the two percentiles, e.g., ``(2, 98)``.
+    nice : bool, default: True
+        If True rounds the levels to "nice" numbers, see `robust_levels`.
+
+    Returns
+    -------
+    cmap : ListedColormap
+        The colormap, as returned by `from_levels_and_cmap`.
+    norm : BoundaryNorm
+        The norm, ``norm.boundaries`` are the levels.
+    extend : {'neither', 'min', 'max', 'both'}
+        Whether data falls below the lowest or on or above the highest level. Used for
+        the colormap and can be passed to the colorbar.
+
+    Examples
+    --------
+    >>> import matplotlib.pyplot as plt
+    >>> import mplotutils as mpu
+
+    >>> da = mpu.sample_dataarray(36, 18)
+    >>> panels = [da, da * 2]
+    >>> cmap, norm, extend = mpu.from_data_and_cmap(panels, "viridis")
+
+    >>> f, axs = plt.subplots(2)
+    >>> for ax, panel in zip(axs, panels):
+    ...     h = ax.pcolormesh(panel, cmap=cmap, norm=norm)
+    >>> cbar = mpu.colorbar(h, axs, extend=extend)
+
+    Notes
+    -----
+    The limits (and percentiles) of all panels are computed in a single pass over
+    the data, for dask-backed data in one ``dask.compute``. The percentiles are
+    estimated as in `robust_levels`.
+    """
+
+    if isinstance(data, list | tuple):
+        arrays = list(data)
+    else:
+        arrays = [data]
+
+    quantiles = None if percentiles is None else _parse_percentiles(percentiles)
+
+    result, data_min, data_max = _reduce(arrays, quantiles)
+
+    vmin, vmax = (data_min, data_max) if result is None else result.tolist()
+
+    levels = _levels_from_range(vmin, vmax, n, nice)
+    extend = _suggest_extend(levels, data_min, data_max)
+
+    cmap, norm = from_levels_and_cmap(levels, cmap, extend=extend)
+
+    return cmap, norm, extend
+
+
+def _suggest_extend(levels, data_min, data_max):
+
+    # BoundaryNorm assigns values equal to the highest level to the 'over' color
+    lower = data_min < levels[0]
+    upper = data_max >= levels[-1]
+
+    if lower and upper:
+        return "both"
+    if lower:
+        return "min"
+    if upper:
+        return "max"
+    return "neither"
+
+
+def _levels_from_range(vmin, vmax, n, nice):
+
+    if n < 2:
+        raise ValueError(f"Need at least 2 levels, got n={n}")
+
+    # as xarray for integer levels
+    locator = mpl.ticker.MaxNLocator(n - 1)
+
+    if nice:
+        return locator.tick_values(vmin, vmax)
+
+    vmin, vmax = locator.nonsingular(vmin, vmax)
+    return np.linspace(vmin, vmax, n)
+
+
+def _robust_range(data, percentiles):
+
+    quantiles = _parse_percentiles(percentiles)
+
+    result, __, __ = _reduce([data], quantiles)
+
+    return tuple(result.tolist())
+
+
+def _parse_percentiles(percentiles):
+
+    lower, upper = percentiles
+
+    if not 0 <= lower < upper <= 100:
+        raise ValueError(
+            f"'percentiles' must be increasing and in 0..100, got {percentiles}"
+        )
+
+    return np.array([lower, upper]) / 100
+
+
+def _reduce(arrays, quantiles):
+    # estimate the quantiles (if not None) and get the minimum and maximum of the
+    # finite values of all arrays - in one pass over the data
+
+    arrays = [arr.data if isinstance(arr, xr.DataArray) else arr for arr in arrays]
+    sketch = quantiles is not None
+
+    if any(_is_dask_collection(arr) for arr in arrays):
+        count, vmin, vmax, values, weights = _dask_reduce(arrays, sketch)
+
+        if not count:
+            raise ValueError("'data' has no finite values")
+
+        result = _sketch_quantiles(values, weights, quantiles) if sketch else None
+
+    else:
+        data = np.concatenate([np.asarray(arr, dtype=float).ravel() for arr in arrays])
+        data = data[np.isfinite(data)]
+
+        if not data.size:
+            raise ValueError("'data' has no finite values")
+
+        vmin, vmax = data.min(), data.max()
+        result = np.quantile(data, quantiles) if sketch else None
+
+    return result, float(vmin), float(vmax)
+
+
+def _dask_reduce(arrays, sketch):
+
+    import dask
+    import dask.array
+
+    blocks = [
+        block for arr in arrays for block in dask.array.asarray(arr).to_delayed().flat
+    ]
+    summaries = [dask.delayed(_block_summary)(block, sketch) for block in blocks]
+
+    # tree reduction, so only a few summaries are merged at once
+    while len(summaries) > 1:
+        summaries = [
+            dask.delayed(_merge_summaries)(*summaries[i : i + _SKETCH_SPLIT_EVERY])
+            for i in range(0, len(summaries), _SKETCH_SPLIT_EVERY)
+        ]
+
+    return summaries[0].compute()
+
+
+def _block_summary(block, sketch):
+    # number, min and max of the finite values of a block, and a sketch summarizing
+    # them with at most _SKETCH_SIZE weighted points
+
+    block = np.asarray(block, dtype=float).ravel()
+    block = block[np.isfinite(block)]
+
+    if not block.size:
+        return 0, np.inf, -np.inf, np.empty(0), np.empty(0)
+
+    if not sketch:
+        values = weights = np.empty(0)
+    elif block.size <= _SKETCH_SIZE:
+        values, weights = np.sort(block), np.ones(block.size)
+    else:
+        # the midpoints of _SKETCH_SIZE equal-count bins
+        q = (np.arange(_SKETCH_SIZE) + 0.5) / _SKETCH_SIZE
+        values = np.quantile(block, q)
+        weights = np.full(_SKETCH_SIZE, block.size / _SKETCH_SIZE)
+
+    return block.size, block.min(), block.max(), values, weights
+
+
+def _merge_summaries(*summaries):
+
+    count = sum(summary[0] for summary in summaries)
+    vmin = min(summary[1] for summary in summaries)
+    vmax = max(summary[2] for summary in summaries)
+
+    sketches = [(values, weights) for *_, values, weights in summaries]
+    values, weights = _merge_sketches(*sketches)
+
+    return count, vmin, vmax, values, weights
+
+
+def _merge_sketches(*sketches):
+
+    values = np.concatenate([values for values, _ in sketches])
+    weights = np.concatenate([weights for _, weights in sketches])
+
+    order = np.argsort(values, kind="stable")
+    values, weights = values[order], weights[order]
+
+    if values.size <= _SKETCH_SIZE:
+        return values, weights
+
+    # compress to _SKETCH_SIZE points with equal weights
+    total = weights.sum()
+    ranks = (np.arange(_SKETCH_SIZE) + 0.5) / _SKETCH_SIZE * total
+    idx = np.searchsorted(np.cumsum(weights), ranks)
+    idx = np.minimum(idx, values.size - 1)
+
+    return values[idx], np.full(_SKETCH_SIZE, total / _SKETCH_SIZE)
+
+
+def _sketch_quantiles(values, weights, quantiles):
+
+    # the rank of each point is at the center of its weight
+    cumulative = np.cumsum(weights)
+    centers = (cumulative - weights / 2) / cumulative[-1]
+
+    return np.interp(quantiles, centers, values)
@@ -66,9 +66,6 @@ def _set_map_layout_axes(axs, width, nrow, ncol):
     if isinstance(f, mpl.figure.SubFigure) or f.subfigs:
         raise RuntimeError("matplotlib SubFigure not supported")
 
-    # getting the correct data ratio of geoaxes requires draw
-    f.canvas.draw()
-
     bottom = f.subplotpars.bottom
     top = f.subplotpars.top
     left = f.subplotpars.left
@@ -77,7 +74,7 @@ def _set_map_layout_axes(axs, width, nrow, ncol):
     wspace = f.subplotpars.wspace
 
     # data ratio is the aspect
-    aspect = ax.get_data_ratio()
+    aspect = _get_data_ratio(ax)
 
     if nrow is None and ncol is None:
         # get geometry tells how many subplots there are
@@ -107,8 +104,8 @@ def _set_map_layout_axes_grid(axgr, width, nrow, ncol):
 
     f = ax.get_figure()
 
-    # getting the correct data ratio of geoaxes requires draw
-    f.canvas.draw()
+    # the divider computes the aspect from the data limits of the axes
+    _get_data_ratio(ax)
 
     bottom = f.subplotpars.bottom
     top = f.subplotpars.top
@@ -143,3 +140,20 @@ def _set_map_layout_axes_grid(axgr, width, nrow, ncol):
     height = inner_height / height_fraction
 
     f.set_size_inches(width / 2.54, height / 2.54)
+
+
+def _get_data_ratio(ax):
+    # the view limits of GeoAxes are autoscaled lazily (limited to the bounds of the
+    # projection), so the aspect is known without drawing the figure - unless
+    # apply_aspect adjusts the limits on draw
+
+    if ax.get_aspect() == "auto" or ax.get_adjustable() != "datalim":
+        aspect = ax.get_data_ratio()
+
+        if np.isfinite(aspect) and aspect > 0:
+            return aspect
+
+    # fall back to drawing the figure
+    ax.get_figure().canvas.draw()
+
+    return ax.get_data_ratio()
@@ -1,53 +1,33 @@
-from functools import wraps
+import warnings
 
-from matplotlib.figure import Figure
 
-# ensure the original implementation is not overwritten
-try:
-    savefig_orig
-except NameError:
-    savefig_orig = Figure.savefig
-
-
-def savefig(func):
-
-    @wraps(func)
-    def inner(self, *args, **kwargs):
-
-        # call draw in any case
-        self.canvas.draw()
-
-        return func(self, *args, **kwargs)
-
-    return inner
+class autodraw:
+    """toggle drawing figures before saving them - deprecated
 
+    Figures using ``mpu.colorbar`` used to be drawn before saving them to ensure the
+    layout is correct. The colorbars are now positioned during the draw of
+    ``savefig`` itself, so this is not required any more and ``Figure.savefig`` is no
+    longer patched. ``toggle`` has no effect. Can be used as context manager.
 
-class autodraw:
+    Parameters
+    ----------
+    toggle : bool
+        Ignored.
+    """
 
     def __init__(self, /, toggle):
 
+        warnings.warn(
+            "`mpu.autodraw` is deprecated and has no effect - figures using"
+            " `mpu.colorbar` no longer need to be drawn before saving",
+            FutureWarning,
+            stacklevel=2,
+        )
+
         self.toggle = toggle
-        if toggle:
-            monkeypatch()
-        else:
-            undo()
 
     def __enter__(self):
         return
 
     def __exit__(self, type, value, traceback):
-
-        if self.toggle:
-            undo()
-        else:
-            monkeypatch()
-
-
-def monkeypatch():
-    # Monkey patch matplotlib to call our savefig instead of the standard
-
-    Figure.savefig = savefig(savefig_orig)
-
-
-def undo():
-    Figure.savefig = savefig_orig
+        return
@@ -0,0 +1,183 @@
+import os
+
+import cartopy.crs as ccrs
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+import xarray as xr
+
+import mplotutils as mpu
+from mplotutils._cache import _hash_key
+
+from . import figure_context
+
+
+class FactoryCalled:
+    def __init__(self):
+        self.n_calls = 0
+
+    def __call__(self):
+        self.n_calls += 1
+        f, ax = plt.subplots(figsize=(2, 1))
+        ax.plot([0, 1])
+        return f
+
+
+def test_render_cache_factory(tmp_path):
+
+    cache = mpu.RenderCache(tmp_path / "cache")
+    factory = FactoryCalled()
+
+    data = np.arange(5)
+
+    hit = cache.savefig(factory, tmp_path / "fig0.png", key=data, dpi=20)
+    assert not hit
+    assert factory.n_calls == 1
+
+    hit = cache.savefig(factory, tmp_path / "fig1.png", key=data.copy(), dpi=20)
+    assert hit
+    assert factory.n_calls == 1
+
+    fig0 = (tmp_path / "fig0.png").read_bytes()
+    assert fig0 == (tmp_path / "fig1.png").read_bytes()
+
+    # different data, dpi and format are a cache miss
+    cache.savefig(factory, tmp_path / "fig2.png", key=data + 1, dpi=20)
+    cache.savefig(factory, tmp_path / "fig3.png", key=data, dpi=10)
+    cache.savefig(factory, tmp_path / "fig4.pdf", key=data, dpi=20)
+    assert factory.n_calls == 4
+
+    assert cache.stats == {"hits": 1, "misses": 4}
+    assert len(os.listdir(tmp_path / "cache")) == 4
+
+
+def test_render_cache_figure(tmp_path):
+
+    cache = mpu.RenderCache(tmp_path / "cache")
+
+    with figure_context(figsize=(2, 1)) as f:
+        assert not cache.savefig(f, tmp_path / "fig0.png", key="a")
+        assert cache.savefig(f, tmp_path / "fig1.png", key="a")
+
+        # the figure size is part of the key
+        f.set_size_inches(1, 1)
+        assert not cache.savefig(f, tmp_path / "fig2.png", key="a")
+
+
+def test_render_cache_evict(tmp_path):
+
+    cache = mpu.RenderCache(tmp_path / "cache")
+    factory = FactoryCalled()
+
+    for i in range(3):
+        cache.savefig(factory, tmp_path / f"fig{i}.png", key=i, dpi=20)
+
+    size = cache.size
+    assert size > 0
+
+    # set distinct access times and make the first entry the most recently used
+    entries = sorted(cache._entries())
+    for i, (_, _, path) in enumerate(entries):
+        os.utime(path, (i, i))
+    os.utime(entries[0][2], (10, 10))
+
+    cache.max_size = size - 1
+    cache.evict()
+
+    remaining = [path for _, _, path in cache._entries()]
+    assert len(remaining) == 2
+    assert entries[0][2] in remaining
+    assert entries[1][2] not in remaining
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_render_cache_shared(tmp_path, monkeypatch):
+    # entries may be removed by another process using the same directory
+
+    cache = mpu.RenderCache(tmp_path / "cache")
+    other = mpu.RenderCache(tmp_path / "cache")
+    factory = FactoryCalled()
+
+    assert not cache.savefig(factory, tmp_path / "fig0.png", key="a", dpi=20)
+
+    entries = cache._entries()
+    other.clear()
+
+    # a removed entry is a miss
+    assert not cache.savefig(factory, tmp_path / "fig1.png", key="a", dpi=20)
+    assert factory.n_calls == 2
+
+    # already removed files are ignored
+    other.clear()
+    monkeypatch.setattr(cache, "_entries", lambda: entries)
+
+    cache.clear()
+
+    cache.max_size = 0
+    cache.evict()
+
+
+def test_hash_key():
+
+    arr = np.arange(6.0).reshape(2, 3)
+    assert _hash_key(arr) == _hash_key(arr.copy())
+    assert _hash_key(arr) != _hash_key(arr.T)
+    assert _hash_key(arr) != _hash_key(arr.astype(np.float32))
+    assert _hash_key((1, 2)) != _hash_key([1, 2])
+    assert _hash_key({"a": 1, "b": 2}) == _hash_key({"b": 2, "a": 1})
+
+    da = xr.DataArray(arr, dims=("y", "x"), coords={"x": [1, 2, 3]})
+    assert _hash_key(da) == _hash_key(da.copy(deep=True))
+    assert _hash_key(da) != _hash_key(da.assign_coords(x=[1, 2, 4]))
+    assert _hash_key(da) != _hash_key(da.rename("name"))
+
+    cmap, norm = mpu.from_levels_and_cmap([0, 1, 2], "Blues", extend="both")
+    cmap2, norm2 = mpu.from_levels_and_cmap([0, 1, 2], "Blues", extend="both")
+    assert _hash_key((cmap, norm)) == _hash_key((cmap2, norm2))
+
+    cmap3, norm3 = mpu.from_levels_and_cmap([0, 1, 3], "Reds", extend="both")
+    assert _hash_key(cmap) != _hash_key(cmap3)
+    assert _hash_key(norm) != _hash_key(norm3)
+
+    # all parameters of the norms are hashed
+    colors = mpl.colors
+    pairs = (
+        (colors.TwoSlopeNorm(0, -1, 1), colors.TwoSlopeNorm(0.5, -1, 1)),
+        (colors.PowerNorm(2, 0, 1), colors.PowerNorm(3, 0, 1)),
+        (colors.SymLogNorm(1, vmin=-1, vmax=1), colors.SymLogNorm(2, vmin=-1, vmax=1)),
+        (colors.LogNorm(1, 10), colors.Normalize(1, 10)),
+        (
+            mpu.from_classes_and_cmap([1, 2, 3], "tab10"),
+            mpu.from_classes_and_cmap([10, 20, 30], "tab10"),
+        ),
+    )
+    for first, second in pairs:
+        assert _hash_key(first) != _hash_key(second)
+
+    norm = colors.SymLogNorm(1, vmin=-1, vmax=1)
+    assert _hash_key(norm) == _hash_key(colors.SymLogNorm(1, vmin=-1, vmax=1))
+
+    with pytest.raises(TypeError, match="Cannot hash object of type"):
+        _hash_key(colors.FuncNorm((np.sqrt, np.square), 0, 1))
+
+    assert _hash_key(ccrs.PlateCarree()) == _hash_key(ccrs.PlateCarree())
+    assert _hash_key(ccrs.PlateCarree()) != _hash_key(ccrs.Robinson())
+
+    with pytest.raises(TypeError, match="Cannot hash object of type"):
+        _hash_key(object())
+
+    with pytest.raises(TypeError, match="dtype object"):
+        _hash_key(np.array([None]))
+
+
+def test_hash_key_dask():
+
+    pytest.importorskip("dask")
+
+    da = xr.DataArray(np.arange(10.0), dims="x").chunk(5)
+
+    assert _hash_key(da) == _hash_key(da.copy())
+    assert _hash_key(da) != _hash_key(da + 1)
@@ -1,9 +1,20 @@
+import gc
+import io
+import pickle
+import weakref
+
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 import pytest
 
 import mplotutils as mpu
-from mplotutils._colorbar import _get_cbax, _parse_shift_shrink, _parse_size_aspect_pad
+from mplotutils._colorbar import (
+    _get_cbax,
+    _parse_shift_shrink,
+    _parse_size_aspect_pad,
+    _ThinningLocator,
+)
 
 from . import figure_context, subplots_context
 
@@ -643,3 +654,420 @@ def test_get_cbax():
 
         _get_cbax(f)
         assert len(f.get_axes()) == 5
+
+
+@pytest.mark.parametrize("orientation", ("vertical", "horizontal"))
+def test_colorbar_single_draw(orientation):
+    # the colorbar is positioned during the draw, no second draw is required
+
+    with figure_context() as f:
+        aspect = 0.5 if orientation == "vertical" else 2
+        ax, cbar = create_fig_aspect(aspect=aspect, orientation=orientation)
+
+        f.savefig(io.BytesIO(), bbox_inches="tight")
+
+        pos_ax = ax.get_position()
+        pos_cbar = cbar.ax.get_position()
+
+        if orientation == "vertical":
+            np.testing.assert_allclose(pos_cbar.y0, pos_ax.y0)
+            np.testing.assert_allclose(pos_cbar.height, pos_ax.height)
+        else:
+            np.testing.assert_allclose(pos_cbar.x0, pos_ax.x0)
+            np.testing.assert_allclose(pos_cbar.width, pos_ax.width)
+
+
+def test_colorbar_extend():
+
+    with figure_context():
+        h, ax = create_figure_subplots()
+        h.set_clim(0.2, 0.8)
+
+        cbar = mpu.colorbar(h, ax, size=0.2, pad=0, extend="both")
+
+        # matplotlib shrinks the colorbar axes to make room for the extends
+        pos = cbar.ax.get_position()
+        assert pos.height < 1
+        np.testing.assert_allclose(pos.y0 + pos.height / 2, 0.5)
+
+
+def test_colorbar_does_not_draw():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+
+        draws = []
+        f.canvas.mpl_connect("draw_event", draws.append)
+
+        cbar = mpu.colorbar(h, ax, size=0.2, pad=0)
+
+        assert not draws
+
+        # the position is set without rendering the figure
+        pos = ax.get_position()
+        assert_position(cbar, [pos.x1, pos.y0, 0.2 * pos.width, pos.height])
+
+
+def test_colorbars():
+
+    with figure_context():
+        h, axs = create_figure_subplots(nrows=2, ncols=2)
+
+        specs = [{"mappable": h, "ax": row} for row in axs]
+        specs[1]["pad"] = 0.1
+
+        cbars = mpu.colorbars(specs, size=0.2, pad=0)
+
+        assert len(cbars) == 2
+        assert cbars[0].ax is not cbars[1].ax
+
+        for cbar, row, pad in zip(cbars, axs, (0, 0.1)):
+            pos = row[0].get_position().union([ax.get_position() for ax in row])
+            expected = [pos.x1 + pad * pos.width, pos.y0, 0.2 * pos.width, pos.height]
+            assert_position(cbar, expected)
+
+
+def test_colorbars_same_as_colorbar():
+
+    with figure_context():
+        h, axs = create_figure_subplots(nrows=2)
+
+        cbar1 = mpu.colorbar(h, axs[0], orientation="horizontal", shrink=0.2)
+        (cbar2,) = mpu.colorbars(
+            [{"mappable": h, "ax": axs[1]}], orientation="horizontal", shrink=0.2
+        )
+
+        pos1, pos2 = cbar1.ax.get_position(), cbar2.ax.get_position()
+        np.testing.assert_allclose(pos1.x0, pos2.x0)
+        np.testing.assert_allclose(pos1.width, pos2.width)
+        assert cbar1.orientation == cbar2.orientation == "horizontal"
+
+
+def test_colorbars_empty():
+
+    assert mpu.colorbars([]) == []
+
+
+def test_colorbars_errors():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+
+        with pytest.raises(ValueError, match="needs a 'mappable' and an 'ax'"):
+            mpu.colorbars([{"mappable": h}])
+
+        # all specs are checked before a colorbar is created
+        with pytest.raises(ValueError, match="'shift' must be in 0...1"):
+            specs = [{"mappable": h, "ax": ax}, {"mappable": h, "ax": ax}]
+            mpu.colorbars(specs, shift=2)
+
+        assert len(f.get_axes()) == 1
+
+
+def test_colorbar_locator_cached():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, size=0.2, pad=0)
+
+        locator = cbar.ax.get_axes_locator()._orig_locator
+
+        bbox = locator(cbar.ax)
+        # nothing changed: the cached position is returned
+        assert locator(cbar.ax) is bbox
+
+        f.set_size_inches(3, 6)
+        assert locator(cbar.ax) is not bbox
+
+        bbox = locator(cbar.ax)
+        ax.set_position([0.1, 0.1, 0.5, 0.5])
+        new = locator(cbar.ax)
+        assert new is not bbox
+        np.testing.assert_allclose(new.bounds, [0.6, 0.1, 0.1, 0.5])
+
+
+@pytest.mark.parametrize("extend", ("neither", "both"))
+def test_detach_colorbar_layout(extend):
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, size=0.2, pad=0, extend=extend)
+
+        f.canvas.draw()
+        expected = cbar.ax.get_position().bounds
+
+        mpu.detach_colorbar_layout(cbar)
+
+        ax.set_position([0.1, 0.1, 0.5, 0.5])
+        f.canvas.draw()
+
+        np.testing.assert_allclose(cbar.ax.get_position().bounds, expected)
+
+        with pytest.raises(TypeError, match="already detached"):
+            mpu.detach_colorbar_layout(cbar)
+
+
+def test_detach_colorbar_layout_error():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        cbar = f.colorbar(h, ax=ax)
+
+        with pytest.raises(TypeError, match="not created by mplotutils"):
+            mpu.detach_colorbar_layout(cbar)
+
+
+def test_colorbar_figure_garbage_collected():
+
+    f, axs = plt.subplots(2, 2)
+    h = axs[0, 0].pcolormesh([[0, 1]])
+    mpu.colorbar(h, axs)
+
+    ref = weakref.ref(f)
+    plt.close(f)
+    del f, axs, h
+
+    gc.collect()
+    assert ref() is None
+
+
+def test_colorbar_pickle():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        mpu.colorbar(h, ax, size=0.2, pad=0)
+
+        f2 = pickle.loads(pickle.dumps(f))
+        ax2, cbax2 = f2.get_axes()
+
+        # the unpickled colorbar follows the unpickled axes
+        ax2.set_position([0.1, 0.1, 0.5, 0.5])
+        f2.canvas.draw()
+
+        np.testing.assert_allclose(cbax2.get_position().bounds, [0.6, 0.1, 0.1, 0.5])
+        plt.close(f2)
+
+
+@pytest.mark.parametrize("rasterized", (True, False))
+def test_colorbar_rasterized(rasterized):
+
+    with figure_context():
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, rasterized=rasterized)
+
+        assert cbar.solids.get_rasterized() is rasterized
+
+
+def test_colorbar_rasterized_default():
+
+    with figure_context():
+        levels = np.linspace(0, 1, 101)
+        cmap, norm = mpu.from_levels_and_cmap(levels, "viridis")
+
+        h, ax = create_figure_subplots()
+        h.set_cmap(cmap)
+        h.set_norm(norm)
+
+        # matplotlib rasterizes colorbars with many colors
+        cbar = mpu.colorbar(h, ax)
+        assert cbar.solids.get_rasterized()
+
+        cbar = mpu.colorbar(h, ax, rasterized=False)
+        assert not cbar.solids.get_rasterized()
+
+
+@pytest.mark.parametrize("orientation", ("vertical", "horizontal"))
+def test_colorbar_tick_spacing(orientation):
+
+    with figure_context() as f:
+        levels = np.linspace(0, 1, 201)
+        cmap, norm = mpu.from_levels_and_cmap(levels, "viridis")
+
+        h, ax = create_figure_subplots(orientation=orientation)
+        h.set_cmap(cmap)
+        h.set_norm(norm)
+
+        cbar = mpu.colorbar(
+            h, ax, orientation=orientation, ticks=levels, tick_spacing=30
+        )
+        f.canvas.draw()
+
+        bbox = cbar.ax.bbox
+        length = bbox.height if orientation == "vertical" else bbox.width
+        length = length * 72 / f.dpi
+
+        ticks = cbar.get_ticks()
+        assert 2 <= ticks.size <= length // 30 + 1
+        assert ticks[0] == 0
+        np.testing.assert_allclose(np.diff(ticks), ticks[1] - ticks[0])
+
+        # the ticks are cached
+        locator = cbar.locator
+        assert locator() is locator()
+
+        # and updated if the colorbar gets longer
+        f.set_size_inches(f.get_size_inches() * 2)
+        f.canvas.draw()
+        assert cbar.get_ticks().size > ticks.size
+
+
+def test_colorbar_categorical():
+
+    with figure_context():
+        classes = [10, 20, 90]
+        cmap, norm = mpu.from_classes_and_cmap(classes, "tab10")
+
+        h, ax = create_figure_subplots()
+        h.set_cmap(cmap)
+        h.set_norm(norm)
+
+        cbar = mpu.colorbar(h, ax)
+
+        np.testing.assert_equal(cbar.get_ticks(), [0, 1, 2])
+        labels = [cbar.formatter(tick) for tick in cbar.get_ticks()]
+        assert labels == ["10", "20", "90"]
+
+        # explicit ticks are respected
+        cbar = mpu.colorbar(h, ax, ticks=[1])
+        np.testing.assert_equal(cbar.get_ticks(), [1])
+
+
+def test_colorbar_tick_spacing_error():
+
+    with figure_context():
+        h, ax = create_figure_subplots()
+
+        with pytest.raises(ValueError, match="'tick_spacing' must be positive"):
+            mpu.colorbar(h, ax, tick_spacing=0)
+
+
+def test_colorbar_tick_spacing_set_norm():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, tick_spacing=30)
+
+        # matplotlib resets the locator when the norm changes
+        levels = np.linspace(0, 1, 101)
+        h.set_norm(mpl.colors.BoundaryNorm(levels, ncolors=256))
+
+        assert isinstance(cbar.locator, _ThinningLocator)
+        f.canvas.draw()
+        assert cbar.get_ticks().size < levels.size
+
+        # also for a rebound mappable
+        h_new = ax.pcolormesh([[0, 2]])
+        mpu.rebind_colorbar(cbar, h_new)
+        h_new.set_norm(mpl.colors.BoundaryNorm(levels, ncolors=256))
+
+        assert isinstance(cbar.locator, _ThinningLocator)
+        assert cbar.locator.spacing == 30
+
+
+def test_rebind_colorbar():
+
+    with figure_context() as f:
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, size=0.2, pad=0)
+        f.canvas.draw()
+
+        pos = cbar.ax.get_position().bounds
+        n_axes = len(f.get_axes())
+
+        h.remove()
+        h_new = ax.pcolormesh([[0, 2]], cmap="Reds")
+
+        mpu.rebind_colorbar(cbar, h_new)
+
+        assert cbar.mappable is h_new
+        assert h_new.colorbar is cbar
+        assert h.colorbar is None
+        assert cbar.cmap.name == "Reds"
+        assert cbar.norm.vmax == 2
+
+        # the old mappable no longer updates the colorbar
+        h.set_clim(0, 10)
+        assert cbar.norm.vmax == 2
+
+        # but the new one does
+        h_new.set_clim(0, 5)
+        assert cbar.norm.vmax == 5
+
+        f.canvas.draw()
+        assert len(f.get_axes()) == n_axes
+        np.testing.assert_allclose(cbar.ax.get_position().bounds, pos)
+
+
+def test_rebind_colorbar_norm():
+
+    with figure_context():
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax, tick_spacing=20)
+
+        norm = mpl.colors.BoundaryNorm([0, 0.5, 1], ncolors=256)
+        mpu.rebind_colorbar(cbar, norm=norm)
+
+        assert h.norm is norm
+        assert cbar.norm is norm
+
+        # the tick thinning is kept if the norm changes
+        assert isinstance(cbar.locator, _ThinningLocator)
+
+
+def test_rebind_colorbar_error():
+
+    with figure_context():
+        h, ax = create_figure_subplots()
+        cbar = mpu.colorbar(h, ax)
+
+        with pytest.raises(TypeError, match="at least one of 'mappable' and 'norm'"):
+            mpu.rebind_colorbar(cbar)
+
+
+@pytest.mark.parametrize("orientation", ("vertical", "horizontal"))
+def test_colorbar_subfigure(orientation):
+
+    with figure_context() as f:
+        __, subfig = f.subfigures(1, 2)
+        ax = subfig.subplots()
+        h = ax.pcolormesh([[0, 1]])
+
+        cbar = mpu.colorbar(h, ax, orientation=orientation, aspect=10)
+
+        assert cbar.ax.get_figure() is subfig
+
+        pos_ax = ax.get_position()
+        pos_cbar = cbar.ax.get_position()
+
+        # the colorbar is positioned in subfigure coordinates
+        if orientation == "vertical":
+            np.testing.assert_allclose(pos_cbar.height, pos_ax.height)
+            expected = 10
+        else:
+            np.testing.assert_allclose(pos_cbar.width, pos_ax.width)
+            expected = 1 / 10
+
+        bbox = cbar.ax.bbox
+        np.testing.assert_allclose(bbox.height / bbox.width, expected)
+
+
+def test_colorbar_axes_grid():
+    from mpl_toolkits.axes_grid1 import AxesGrid
+
+    with figure_context() as f:
+        axgr = AxesGrid(f, 111, nrows_ncols=(2, 2), axes_pad=0.1)
+        h = axgr[0].pcolormesh([[0, 1]])
+
+        cbar = mpu.colorbar(h, axgr.axes_row[0], size=0.1, pad=0)
+
+        # the position is correct without drawing the figure
+        pos = (
+            axgr.axes_row[0][0]
+            .get_position()
+            .union([ax.get_position() for ax in axgr.axes_row[0]])
+        )
+        expected = [pos.x1, pos.y0, 0.1 * pos.width, pos.height]
+        assert_position(cbar, expected)
+
+        f.canvas.draw()
+        assert_position(cbar, expected)
@@ -0,0 +1,201 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import mplotutils as mpu
+
+
+def sample_data(shape=(20, 30), seed=0):
+
+    rng = np.random.default_rng(seed)
+    data = rng.uniform(-0.5, 1.5, shape)
+    data.flat[:3] = [np.nan, 1.0, 0.25]
+
+    return data
+
+
+@pytest.mark.parametrize("extend", ("neither", "min", "max", "both"))
+def test_classify_colorize_same_as_norm(extend):
+
+    levels = [0, 0.25, 0.5, 0.75, 1]
+    cmap, norm = mpu.from_levels_and_cmap(levels, "viridis", extend=extend)
+
+    data = sample_data()
+
+    result = mpu.colorize(mpu.classify(data, levels), cmap)
+
+    # matplotlib masks invalid data before plotting
+    expected = cmap(norm(np.ma.masked_invalid(data)), bytes=True)
+
+    assert result.dtype == np.uint8
+    np.testing.assert_equal(result, expected)
+
+
+def test_classify():
+
+    levels = [0, 1, 2]
+    data = np.array([-1, 0, 0.5, 1, 2, 3, np.nan])
+
+    result = mpu.classify(data, levels)
+    expected = np.array([0, 1, 1, 2, 3, 3, 4])
+
+    np.testing.assert_equal(result, expected)
+
+
+@pytest.mark.parametrize("value", (5.0, np.array(5.0), np.nan))
+def test_classify_scalar(value):
+
+    levels = [0, 1, 2]
+
+    result = mpu.classify(value, levels)
+    expected = 4 if np.isnan(value) else 3
+
+    assert result.shape == ()
+    assert result == expected
+
+    rgba = mpu.colorize(result, mpu.from_levels_and_cmap(levels, "Blues")[0])
+    assert rgba.shape == (4,)
+
+
+def test_classify_masked():
+
+    data = np.ma.masked_array([0.5, 1.5], mask=[True, False])
+
+    result = mpu.classify(data, [0, 1, 2])
+    np.testing.assert_equal(result, [4, 2])
+
+
+def test_classify_int():
+
+    data = np.array([[0, 1], [2, 3]])
+
+    result = mpu.classify(data, [0.5, 1.5, 2.5])
+    np.testing.assert_equal(result, [[0, 1], [2, 3]])
+
+
+@pytest.mark.parametrize("n_levels, dtype", ((10, np.uint8), (300, np.uint16)))
+def test_classify_dtype(n_levels, dtype):
+
+    levels = np.linspace(0, 1, n_levels)
+    result = mpu.classify(sample_data(), levels)
+
+    assert result.dtype == dtype
+
+
+def test_classify_levels_errors():
+
+    with pytest.raises(ValueError, match="'levels' must be a list of levels"):
+        mpu.classify(sample_data(), 3)
+
+    with pytest.raises(ValueError, match="Need at least two 'levels'"):
+        mpu.classify(sample_data(), [1])
+
+    with pytest.raises(ValueError, match="must be monotonically increasing"):
+        mpu.classify(sample_data(), [1, 0, 2])
+
+
+def test_colorize_errors():
+
+    cmap, __ = mpu.from_levels_and_cmap([0, 1, 2], "viridis")
+
+    with pytest.raises(ValueError, match=r"'indices' must be in 0..4"):
+        mpu.colorize(np.array([5]), cmap)
+
+    with pytest.raises(ValueError, match=r"'indices' must be in 0..4"):
+        mpu.colorize(np.array([-1]), cmap)
+
+
+@pytest.mark.parametrize("chunks", (None, {"y": 7}))
+def test_classify_colorize_dataarray(chunks):
+
+    if chunks is not None:
+        pytest.importorskip("dask")
+
+    levels = [0, 0.5, 1]
+    cmap, __ = mpu.from_levels_and_cmap(levels, "Blues", extend="both")
+
+    data = sample_data()
+    da = xr.DataArray(data, dims=("y", "x"))
+
+    if chunks is not None:
+        da = da.chunk(chunks)
+
+    indices = mpu.classify(da, levels)
+    rgba = mpu.colorize(indices, cmap)
+
+    assert isinstance(rgba, xr.DataArray)
+    assert rgba.dims == ("y", "x", "rgba")
+
+    if chunks is not None:
+        # not computed yet
+        assert rgba.chunks is not None
+
+    expected = mpu.colorize(mpu.classify(data, levels), cmap)
+    np.testing.assert_equal(rgba.values, expected)
+
+
+def test_categorize():
+
+    data = np.array([[90, 10, 20], [10, 5, 90]], dtype=np.int16)
+    indices = mpu.categorize(data, [10, 90, 20])
+
+    assert indices.dtype == np.uint8
+    np.testing.assert_equal(indices, [[1, 0, 2], [0, 3, 1]])
+
+    # NaN is not a class
+    indices = mpu.categorize(np.array([1.0, np.nan, 2.0]), [1, 2])
+    np.testing.assert_equal(indices, [0, 2, 1])
+
+    indices = mpu.categorize(np.arange(300), np.arange(300))
+    assert indices.dtype == np.uint16
+
+
+def test_categorize_errors():
+
+    with pytest.raises(ValueError, match="'classes' must be a list of classes"):
+        mpu.categorize([1], 1)
+
+    with pytest.raises(ValueError, match="Need at least one class"):
+        mpu.categorize([1], [])
+
+    with pytest.raises(ValueError, match="'classes' must be unique"):
+        mpu.categorize([1], [1, 1])
+
+
+def test_categorize_colorize():
+
+    classes = [10, 20, 90]
+    cmap, norm = mpu.from_classes_and_cmap(classes, ["r", "g", "b"])
+
+    data = np.array([[90, 10, 20], [10, 5, 90]])
+    indices = mpu.categorize(data, classes)
+
+    result = mpu.colorize(indices, cmap)
+    expected = cmap(norm(indices), bytes=True)
+
+    np.testing.assert_equal(result, expected)
+
+    # the first class is red, values that are not a class are transparent
+    np.testing.assert_equal(result[0, 1], [255, 0, 0, 255])
+    np.testing.assert_equal(result[1, 1], [0, 0, 0, 0])
+
+    with pytest.raises(ValueError, match=r"'indices' must be in 0..3"):
+        mpu.colorize(np.array([4]), cmap)
+
+
+@pytest.mark.parametrize("chunks", (None, {"y": 1}))
+def test_categorize_dataarray(chunks):
+
+    if chunks is not None:
+        pytest.importorskip("dask")
+
+    data = np.array([[90, 10, 20], [10, 5, 90]])
+    da = xr.DataArray(data, dims=("y", "x"))
+
+    if chunks is not None:
+        da = da.chunk(chunks)
+
+    indices = mpu.categorize(da, [10, 20, 90])
+
+    assert isinstance(indices, xr.DataArray)
+    np.testing.assert_equal(indices.values, [[2, 0, 1], [0, 3, 2]])
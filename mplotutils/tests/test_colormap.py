@@ -1,9 +1,13 @@
+import subprocess
+import sys
+
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pytest
 
 import mplotutils as mpu
+from mplotutils._colormaps import _bank_palette, _palette_bank
 
 
 def test_from_levels_and_cmap_not_list():
@@ -99,3 +103,156 @@ def test_from_levels_and_cmap_color_list_explicit():
     np.testing.assert_equal(cmap.colors[1], np.array([0.0, 0.0, 0.0, 1.0]))  # black
     np.testing.assert_equal(cmap.colors[2], np.array([0.0, 0.0, 1.0, 1.0]))  # blue
     np.testing.assert_equal(cmap.colors[3], np.array([0.0, 0.0, 0.0, 1.0]))  # black
+
+
+def test_from_levels_and_cmap_cached():
+
+    mpu.from_levels_and_cmap.cache_clear()
+
+    levels = [1, 2, 3]
+    cmap1, norm1 = mpu.from_levels_and_cmap(levels, "viridis", extend="both")
+    cmap2, norm2 = mpu.from_levels_and_cmap(levels, "viridis", extend="both")
+
+    info = mpu.from_levels_and_cmap.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+    # new objects are returned
+    assert cmap1 is not cmap2
+    assert norm1 is not norm2
+    assert cmap1 == cmap2
+    np.testing.assert_equal(norm1.boundaries, norm2.boundaries)
+
+    # the cached colors can not be modified
+    with pytest.raises(ValueError, match="read-only"):
+        cmap1.colors[0, 0] = 0.5
+
+    cmap3, __ = mpu.from_levels_and_cmap(levels, "viridis", extend="both")
+    assert cmap3 == cmap2
+
+
+def test_from_levels_and_cmap_cached_color_list():
+
+    mpu.from_levels_and_cmap.cache_clear()
+
+    mpu.from_levels_and_cmap([1, 2, 3], ["b", "k"])
+    mpu.from_levels_and_cmap([1, 2, 3], [(0, 0, 1), "k"])
+
+    # the same colors in a different form
+    assert mpu.from_levels_and_cmap.cache_info().hits == 1
+
+
+def test_from_levels_and_cmap_colormap_not_cached():
+
+    mpu.from_levels_and_cmap.cache_clear()
+
+    mpu.from_levels_and_cmap([1, 2, 3], plt.cm.RdYlGn)
+    mpu.from_levels_and_cmap([1, 2, 3], plt.cm.RdYlGn)
+
+    info = mpu.from_levels_and_cmap.cache_info()
+    assert info.hits == info.misses == 0
+
+
+@pytest.mark.parametrize("name", ("deep", "colorblind6", "rocket", "vlag_r"))
+@pytest.mark.parametrize("n_colors", (3, 12))
+def test_palette_bank_same_as_seaborn(name, n_colors):
+    sns = pytest.importorskip("seaborn")
+
+    result = _bank_palette(name, n_colors)
+    expected = sns.color_palette(name, n_colors=n_colors)
+
+    np.testing.assert_allclose(result, expected)
+
+
+def test_palette_bank():
+
+    # seaborn cycles qualitative palettes
+    result = _bank_palette("deep", 12)
+    assert result.shape == (12, 3)
+    np.testing.assert_allclose(result[0], matplotlib.colors.to_rgb("#4C72B0"))
+    np.testing.assert_equal(result[10:], result[:2])
+
+    # as the reversed colormap registered by seaborn
+    palettes, __ = _palette_bank()
+    cmap = matplotlib.colors.ListedColormap(palettes["rocket"]).reversed()
+    result = _bank_palette("rocket_r", 5)
+    np.testing.assert_allclose(result, cmap(np.linspace(0, 1, 7)[1:-1])[:, :3])
+
+    assert _bank_palette("deep_r", 3) is None
+    assert _bank_palette("not_a_palette", 3) is None
+
+
+def test_from_levels_and_cmap_palette_bank():
+
+    levels = [1, 2, 3, 4]
+    cmap, norm = mpu.from_levels_and_cmap(levels, "mako", extend="both")
+    assert_cmap_norm(cmap, norm, levels, extend="both")
+
+    # seaborn registers its colormaps in matplotlib when imported
+    if "mako" not in matplotlib.colormaps:
+        np.testing.assert_allclose(cmap.colors, _bank_palette("mako", 5)[1:-1])
+
+
+def test_from_classes_and_cmap():
+
+    classes = [10, 20, 90]
+    cmap, norm = mpu.from_classes_and_cmap(classes, "tab10", labels=["a", "b", "c"])
+
+    assert isinstance(cmap, matplotlib.colors.ListedColormap)
+    assert cmap.N == 3
+    np.testing.assert_equal(cmap.get_over(), np.zeros(4))
+    np.testing.assert_equal(cmap.get_under(), np.zeros(4))
+
+    assert isinstance(norm, matplotlib.colors.NoNorm)
+    assert norm.labels == ["a", "b", "c"]
+    np.testing.assert_equal(norm.classes, classes)
+
+    # the indices are not converted
+    indices = np.array([0, 2, 1, 3], dtype=np.uint8)
+    result = cmap(norm(indices))
+    expected = list(cmap.colors[[0, 2, 1]]) + [np.zeros(4)]
+    np.testing.assert_equal(result, expected)
+
+
+def test_from_classes_and_cmap_default_labels():
+
+    __, norm = mpu.from_classes_and_cmap([1, 5], ["r", "b"])
+    assert norm.labels == ["1", "5"]
+
+
+def test_from_classes_and_cmap_errors():
+
+    with pytest.raises(ValueError, match="'classes' must be a list of classes"):
+        mpu.from_classes_and_cmap(3, "tab10")
+
+    with pytest.raises(ValueError, match="Need one label per class"):
+        mpu.from_classes_and_cmap([1, 2], "tab10", labels=["a"])
+
+
+def test_from_levels_and_cmap_no_seaborn_pyplot_import():
+
+    code = """
+import sys
+
+import matplotlib
+matplotlib.use("agg")
+import mplotutils as mpu
+
+# record import attempts, also if seaborn is not installed
+attempts = []
+
+class Finder:
+    def find_spec(self, name, path, target=None):
+        attempts.append(name)
+
+sys.meta_path.insert(0, Finder())
+
+mpu.from_levels_and_cmap([1, 2, 3], "deep")
+mpu.from_levels_and_cmap([1, 2, 3], "viridis")
+mpu.from_levels_and_cmap([1, 2, 3], "red")
+
+assert "seaborn" not in attempts
+assert "seaborn" not in sys.modules
+assert "matplotlib.pyplot" not in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
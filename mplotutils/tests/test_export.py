@@ -0,0 +1,304 @@
+import functools
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import mplotutils as mpu
+
+from . import figure_context
+
+
+def create_figure(orientation="vertical"):
+    f = plt.figure()
+    create_figure_on(f, orientation=orientation)
+    return f
+
+
+def create_figure_on(f, orientation="vertical"):
+    ax = f.subplots()
+    h = ax.pcolormesh([[0, 1]])
+    ax.set_aspect(0.5)
+    mpu.colorbar(h, ax, orientation=orientation)
+
+
+def read_png_header(fname):
+    with open(fname, "rb") as f:
+        return f.read(8)
+
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def test_savefig_many_errors(tmp_path):
+
+    with pytest.raises(ValueError, match="Need as many 'fnames' as 'figures'"):
+        mpu.savefig_many([create_figure], [])
+
+    with pytest.raises(TypeError, match="must be Figure instances or callables"):
+        mpu.savefig_many([None], [tmp_path / "fig.png"])
+
+
+def test_savefig_many_factories(tmp_path):
+
+    factories = [
+        create_figure,
+        functools.partial(create_figure, orientation="horizontal"),
+    ]
+    fnames = [tmp_path / "fig0.png", tmp_path / "fig1.png"]
+
+    timings = mpu.savefig_many(factories, fnames, processes=2, dpi=50)
+
+    assert [timing["fname"] for timing in timings] == fnames
+    for timing in timings:
+        assert timing["build"] > 0
+        assert timing["save"] > 0
+
+    for fname in fnames:
+        assert read_png_header(fname) == PNG_HEADER
+
+
+def test_savefig_many_figures(tmp_path):
+
+    with figure_context() as f:
+        f.subplots().plot([0, 1])
+
+        fnames = [tmp_path / "fig0.png", tmp_path / "fig1.png"]
+        timings = mpu.savefig_many([f, create_figure], fnames, processes=1)
+
+        assert timings[0]["build"] == 0
+        assert timings[1]["build"] > 0
+
+        for fname in fnames:
+            assert read_png_header(fname) == PNG_HEADER
+
+
+def test_export_raster_errors(tmp_path):
+
+    with figure_context() as f:
+        with pytest.raises(ValueError, match="Each output needs a 'fname'"):
+            mpu.export_raster(f, [{"size": (10, 10)}])
+
+        with pytest.raises(ValueError, match="Can only pass one of 'size' and 'scale'"):
+            mpu.export_raster(f, [{"fname": "a.png", "size": (10, 10), "scale": 1}])
+
+        with pytest.raises(ValueError, match="Cannot infer the image format"):
+            mpu.export_raster(f, [{"fname": tmp_path / "figure"}])
+
+
+def test_export_raster(tmp_path, monkeypatch):
+
+    from PIL import Image
+
+    with figure_context(figsize=(4, 2), dpi=100) as f:
+        ax = f.subplots()
+        ax.pcolormesh([[0, 1]])
+
+        outputs = [
+            {"fname": tmp_path / "full.png"},
+            {"fname": tmp_path / "thumb.png", "scale": 0.25},
+            {"fname": tmp_path / "preview.jpg", "size": (40, 20), "quality": 80},
+            {"fname": tmp_path / "crop.png", "crop": (0, 0, 100, 50)},
+            {"fname": tmp_path / "figure", "format": "png"},
+        ]
+
+        n_draws = []
+        draw = f.canvas.draw
+        monkeypatch.setattr(f.canvas, "draw", lambda: n_draws.append(draw()))
+
+        mpu.export_raster(f, outputs, dpi=50)
+
+        assert len(n_draws) == 1
+        assert f.dpi == 100
+
+    expected = {
+        "full.png": ("PNG", "RGBA", (200, 100)),
+        "thumb.png": ("PNG", "RGBA", (50, 25)),
+        "preview.jpg": ("JPEG", "RGB", (40, 20)),
+        "crop.png": ("PNG", "RGBA", (100, 50)),
+        "figure": ("PNG", "RGBA", (200, 100)),
+    }
+
+    for fname, (fmt, mode, size) in expected.items():
+        with Image.open(tmp_path / fname) as image:
+            assert (image.format, image.mode, image.size) == (fmt, mode, size)
+
+
+class FakeManager:
+    def __init__(self):
+        self.resized = []
+
+    def resize(self, width, height):
+        self.resized.append((width, height))
+
+
+@pytest.mark.parametrize(
+    "export",
+    (
+        lambda f, tmp_path: mpu.export_raster(
+            f, [{"fname": tmp_path / "f.png"}], dpi=50
+        ),
+        lambda f, tmp_path: mpu.export_buffer(f, dpi=50),
+    ),
+)
+def test_export_does_not_resize_window(tmp_path, export):
+
+    with figure_context(figsize=(4, 2), dpi=100) as f:
+        manager = FakeManager()
+        f.canvas.manager = manager
+
+        try:
+            export(f, tmp_path)
+        finally:
+            f.canvas.manager = None
+
+        # as savefig, the window of the figure is not resized
+        assert manager.resized == []
+        assert f.dpi == 100
+
+
+def test_export_raster_same_as_savefig(tmp_path):
+
+    from PIL import Image
+
+    with figure_context() as f:
+        create_figure_on(f)
+
+        f.savefig(tmp_path / "savefig.png", dpi=50)
+        mpu.export_raster(f, [{"fname": tmp_path / "export.png"}], dpi=50)
+
+    with Image.open(tmp_path / "savefig.png") as expected:
+        with Image.open(tmp_path / "export.png") as result:
+            np.testing.assert_equal(np.asarray(result), np.asarray(expected))
+
+
+def _block_writer(monkeypatch):
+    # hold back the background writer until the returned event is set
+
+    import threading
+
+    event = threading.Event()
+    save_raster = mpu._export._save_raster
+
+    def _save_raster(*args, **kwargs):
+        event.wait(timeout=10)
+        save_raster(*args, **kwargs)
+
+    monkeypatch.setattr(mpu._export, "_save_raster", _save_raster)
+
+    return event
+
+
+def test_savefig_async(tmp_path, monkeypatch):
+
+    from PIL import Image
+
+    with figure_context(dpi=50) as f:
+        create_figure_on(f)
+
+        mpu.export_raster(f, [{"fname": tmp_path / "expected.png"}])
+
+        redrawn = _block_writer(monkeypatch)
+        future = mpu.savefig_async(f, tmp_path / "result.png")
+
+        # the buffer is copied so redrawing the figure does not change the output
+        f.set_facecolor("r")
+        f.canvas.draw()
+        redrawn.set()
+
+        assert future.result(timeout=10) is None
+
+    with Image.open(tmp_path / "expected.png") as expected:
+        with Image.open(tmp_path / "result.png") as result:
+            np.testing.assert_equal(np.asarray(result), np.asarray(expected))
+
+
+def test_savefig_async_bounded(tmp_path, monkeypatch):
+
+    import threading
+
+    monkeypatch.setattr(mpu._export, "_WRITER_PENDING", threading.BoundedSemaphore(1))
+    written = _block_writer(monkeypatch)
+
+    with figure_context(figsize=(1, 1)) as f:
+        futures = [mpu.savefig_async(f, tmp_path / "fig0.jpg", quality=50)]
+
+        def save():
+            futures.append(mpu.savefig_async(f, tmp_path / "fig1.jpg", quality=50))
+
+        # the first image is not written yet, so the second call has to wait
+        thread = threading.Thread(target=save)
+        thread.start()
+        thread.join(timeout=0.5)
+        assert thread.is_alive()
+        assert len(futures) == 1
+
+        written.set()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+        for future in futures:
+            future.result(timeout=10)
+
+    # all buffers are released
+    assert mpu._export._WRITER_PENDING.acquire(blocking=False)
+
+    for i in range(2):
+        assert (tmp_path / f"fig{i}.jpg").exists()
+
+
+def test_savefig_async_error(tmp_path):
+
+    with figure_context(figsize=(1, 1)) as f:
+        future = mpu.savefig_async(f, tmp_path / "figure.unknown")
+
+        with pytest.raises(ValueError, match="Cannot infer the image format"):
+            future.result(timeout=10)
+
+
+def test_export_buffer_rgba():
+
+    with figure_context(figsize=(4, 2), dpi=100) as f:
+        create_figure_on(f)
+
+        result = mpu.export_buffer(f, dpi=50)
+
+        assert isinstance(result, np.ndarray)
+        assert result.shape == (100, 200, 4)
+        assert result.dtype == np.uint8
+
+        # zero copy: the array is a view of the canvas buffer
+        expected = np.asarray(f.canvas.buffer_rgba())
+        assert np.shares_memory(result, expected)
+
+
+def test_export_buffer_rgba_kwargs_error(monkeypatch):
+
+    with figure_context() as f:
+
+        def draw():
+            raise AssertionError("figure should not be drawn")
+
+        monkeypatch.setattr(f.canvas, "draw", draw)
+
+        with pytest.raises(TypeError, match="Cannot pass keyword arguments"):
+            mpu.export_buffer(f, size=(10, 10))
+
+
+def test_export_buffer_png(tmp_path):
+
+    from PIL import Image
+
+    with figure_context(figsize=(4, 2), dpi=100) as f:
+        create_figure_on(f)
+
+        result = mpu.export_buffer(f, format="png", dpi=50)
+        mpu.export_raster(f, [{"fname": tmp_path / "expected.png"}], dpi=50)
+
+    assert isinstance(result, memoryview)
+    assert bytes(result[:8]) == PNG_HEADER
+    assert bytes(result) == (tmp_path / "expected.png").read_bytes()
+
+    with Image.open(io.BytesIO(result)) as image:
+        assert image.size == (200, 100)
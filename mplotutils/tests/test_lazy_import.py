@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+import mplotutils as mpu
+
+
+def test_import_is_lazy():
+
+    code = (
+        "import sys, mplotutils; "
+        "print(','.join(m for m in ('cartopy', 'xarray', 'matplotlib.pyplot', "
+        "'mpl_toolkits.axes_grid1') if m in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_savefig_not_patched_on_import():
+
+    code = (
+        "import matplotlib.figure; savefig = matplotlib.figure.Figure.savefig; "
+        "import mplotutils; print(matplotlib.figure.Figure.savefig is savefig)"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "True"
+
+
+@pytest.mark.parametrize("name", mpu.__all__)
+def test_lazy_attributes(name):
+
+    assert getattr(mpu, name) is not None
+    assert name in dir(mpu)
+
+
+def test_lazy_attribute_error():
+
+    with pytest.raises(AttributeError, match="has no attribute 'not_an_attribute'"):
+        mpu.not_an_attribute
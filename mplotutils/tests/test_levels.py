@@ -0,0 +1,214 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import mplotutils as mpu
+from mplotutils._levels import (
+    _merge_sketches,
+    _robust_range,
+    _sketch_quantiles,
+    _suggest_extend,
+)
+
+
+def sample_data(shape=(300, 400), seed=0):
+
+    rng = np.random.default_rng(seed)
+    data = rng.standard_gamma(2, shape)
+    data[::7, ::3] = np.nan
+
+    return data
+
+
+def rank(data, value):
+    data = data[np.isfinite(data)]
+    return (data < value).mean()
+
+
+def test_robust_levels_numpy():
+
+    data = sample_data()
+
+    result = mpu.robust_levels(data, n=5, nice=False)
+    vmin, vmax = np.nanpercentile(data, [2, 98])
+
+    np.testing.assert_allclose(result, np.linspace(vmin, vmax, 5))
+
+
+def test_robust_levels_nice():
+
+    data = xr.DataArray(sample_data())
+
+    result = mpu.robust_levels(data)
+    vmin, vmax = np.nanpercentile(data, [2, 98])
+
+    # the nice levels span the range
+    assert result[0] <= vmin
+    assert result[-1] >= vmax
+    assert result.size <= 11
+
+    steps = np.diff(result)
+    np.testing.assert_allclose(steps, steps[0])
+
+
+@pytest.mark.parametrize("percentiles", ((2, 98), (0, 100), (10, 50)))
+def test_robust_range_dask(percentiles):
+    pytest.importorskip("dask")
+
+    data = sample_data()
+    da = xr.DataArray(data).chunk({"dim_0": 50, "dim_1": 100})
+
+    vmin, vmax = _robust_range(da, percentiles)
+
+    # the estimate is within a small fraction of a percentile rank
+    lower, upper = np.array(percentiles) / 100
+    np.testing.assert_allclose(rank(data, vmin), lower, atol=1e-3)
+    np.testing.assert_allclose(rank(data, vmax), upper, atol=1e-3)
+
+
+def test_robust_levels_dask_one_pass():
+    dask = pytest.importorskip("dask")
+
+    data = sample_data()
+    da = xr.DataArray(data).chunk(100)
+
+    computes = []
+    largest = []
+
+    class Callback(dask.callbacks.Callback):
+        def _start(self, dsk):
+            computes.append(dsk)
+
+        def _posttask(self, key, result, dsk, state, id):
+            # the summaries are tuples of arrays
+            results = result if isinstance(result, tuple) else (result,)
+            largest.extend(np.size(r) for r in results if isinstance(r, np.ndarray))
+
+    with dask.config.set(scheduler="sync"), Callback():
+        result = mpu.robust_levels(da, n=5, nice=False)
+
+    assert result.size == 5
+
+    # a single compute where no task holds more than one chunk
+    assert len(computes) == 1
+    assert max(largest) <= 100 * 100
+
+
+def test_merge_sketches():
+
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=10_000)
+
+    # many small (exact) sketches
+    sketches = [(np.sort(chunk), np.ones(chunk.size)) for chunk in np.split(data, 100)]
+    values, weights = _merge_sketches(*sketches)
+
+    assert weights.sum() == data.size
+
+    result = _sketch_quantiles(values, weights, np.array([0.1, 0.5, 0.9]))
+    expected = np.quantile(data, [0.1, 0.5, 0.9])
+
+    np.testing.assert_allclose(result, expected, atol=0.01)
+
+
+def test_robust_levels_errors():
+
+    data = sample_data()
+
+    with pytest.raises(ValueError, match="'percentiles' must be increasing"):
+        mpu.robust_levels(data, percentiles=(98, 2))
+
+    with pytest.raises(ValueError, match="'percentiles' must be increasing"):
+        mpu.robust_levels(data, percentiles=(-1, 98))
+
+    with pytest.raises(ValueError, match="Need at least 2 levels"):
+        mpu.robust_levels(data, n=1)
+
+    with pytest.raises(ValueError, match="'data' has no finite values"):
+        mpu.robust_levels(np.full(4, np.nan))
+
+
+def test_robust_levels_errors_dask():
+    pytest.importorskip("dask")
+
+    da = xr.DataArray(np.full((4, 4), np.nan)).chunk(2)
+
+    with pytest.raises(ValueError, match="'data' has no finite values"):
+        mpu.robust_levels(da)
+
+
+@pytest.mark.parametrize("nice", (True, False))
+def test_robust_levels_constant(nice):
+
+    result = mpu.robust_levels(np.ones(10), n=5, nice=nice)
+
+    assert result[0] < 1 < result[-1]
+    assert np.all(np.diff(result) > 0)
+
+
+def test_from_data_and_cmap():
+
+    panels = [np.array([0.1, 0.5]), np.array([[0.2, np.nan], [0.9, 0.3]])]
+
+    cmap, norm, extend = mpu.from_data_and_cmap(panels, "viridis", n=6)
+
+    np.testing.assert_allclose(norm.boundaries, [0, 0.2, 0.4, 0.6, 0.8, 1.0])
+    assert cmap.N == 5
+    assert extend == "neither"
+    assert cmap.colorbar_extend == "neither"
+
+
+def test_from_data_and_cmap_stacked():
+
+    data = sample_data()
+    panels = [data[:150], data[150:]]
+    stacked = xr.DataArray(np.stack(panels), dims=("panel", "y", "x"))
+
+    __, norm1, extend1 = mpu.from_data_and_cmap(panels, "Blues")
+    __, norm2, extend2 = mpu.from_data_and_cmap(stacked, "Blues")
+
+    np.testing.assert_allclose(norm1.boundaries, norm2.boundaries)
+    assert extend1 == extend2
+
+
+def test_from_data_and_cmap_dask():
+    dask = pytest.importorskip("dask")
+
+    data = sample_data()
+    panels = [xr.DataArray(data[:150]).chunk(50), xr.DataArray(data[150:]).chunk(50)]
+
+    # all panels are reduced in a single compute
+    computes = []
+
+    class Callback(dask.callbacks.Callback):
+        def _start(self, dsk):
+            computes.append(dsk)
+
+    with Callback():
+        __, norm, extend = mpu.from_data_and_cmap(panels, "Blues", percentiles=(2, 98))
+
+    assert len(computes) == 1
+
+    __, expected, __ = mpu.from_data_and_cmap(
+        [data[:150], data[150:]], "Blues", percentiles=(2, 98)
+    )
+    np.testing.assert_allclose(norm.boundaries, expected.boundaries)
+
+    # the data extends beyond the robust range (the lowest nice level is 0)
+    assert norm.boundaries[0] == 0
+    assert extend == "max"
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    (
+        ([0.1, 0.9], "neither"),
+        ([-0.1, 0.9], "min"),
+        ([0.1, 1.0], "max"),
+        ([-0.1, 1.5], "both"),
+    ),
+)
+def test_suggest_extend(data, expected):
+
+    levels = [0, 0.5, 1]
+    assert _suggest_extend(levels, min(data), max(data)) == expected
@@ -2,6 +2,7 @@ import io
 
 import matplotlib.pyplot as plt
 import pytest
+from matplotlib.figure import Figure
 
 import mplotutils as mpu
 from mplotutils.tests.test_colorbar import create_fig_aspect
@@ -9,88 +10,57 @@ from mplotutils.tests.test_colorbar import create_fig_aspect
 from . import figure_context
 
 
-def test_autodraw_orig_func():
+def test_autodraw_deprecated():
 
-    # NOTE plt.Figure.savefig is the overwritten one
-    assert mpu._savefig.savefig_orig is not plt.Figure.savefig
+    savefig = Figure.savefig
 
-    with mpu.autodraw(False):
-        assert mpu._savefig.savefig_orig is plt.Figure.savefig
+    # can still be called and used as context manager
+    with pytest.warns(FutureWarning, match="`mpu.autodraw` is deprecated"):
+        mpu.autodraw(False)
+    assert Figure.savefig is savefig
 
-    with mpu.autodraw(False):
-        with mpu.autodraw(True):
-            assert mpu._savefig.savefig_orig is not plt.Figure.savefig
-
-    with mpu.autodraw(False):
-        savefig_autodraw = plt.Figure.savefig
-
-    with mpu.autodraw(True):
-        savefig_no_autodraw = plt.Figure.savefig
-
-    assert savefig_no_autodraw is not savefig_autodraw
-
-    mpu.autodraw(True)
-    assert mpu._savefig.savefig_orig is not plt.Figure.savefig
-
-    mpu.autodraw(False)
-    assert mpu._savefig.savefig_orig is plt.Figure.savefig
-
-    # restore to default
-    mpu.autodraw(True)
-
-
-def test_ensure_draw_method_called(monkeypatch):
-    # this is a pseudo-mock test (I think the actual backend would need to be mocked)
-
-    class DrawMethodCalled(Exception):
-        pass
-
-    def draw():
-        raise DrawMethodCalled()
-
-    with figure_context() as f:
-
-        monkeypatch.setattr(f.canvas, "draw", draw)
-
-        # not called when not autodrawing
+    with pytest.warns(FutureWarning, match="`mpu.autodraw` is deprecated"):
         with mpu.autodraw(False):
-            f.savefig(io.BytesIO())
+            assert Figure.savefig is savefig
 
-        # called when autodrawing
-        with pytest.raises(DrawMethodCalled):
-            f.savefig(io.BytesIO())
+    with pytest.warns(FutureWarning, match="`mpu.autodraw` is deprecated"):
+        with mpu.autodraw(True):
+            assert Figure.savefig is savefig
 
+    assert plt.Figure.savefig is savefig
 
-def test_saved_figure_not_the_same_vertical():
 
-    with figure_context() as f:
-        create_fig_aspect(aspect=0.5, orientation="vertical")
+def test_savefig_draws_once():
 
-        file_no_autodraw = io.BytesIO()
+    with figure_context() as f:
+        ax = f.subplots()
+        h = ax.pcolormesh([[0, 1]])
+        mpu.colorbar(h, ax)
 
-        with mpu.autodraw(False):
-            f.savefig(file_no_autodraw)
+        draws = []
+        f.canvas.mpl_connect("draw_event", draws.append)
 
-        file_autodraw = io.BytesIO()
-        with mpu.autodraw(True):
-            f.savefig(file_autodraw)
+        f.savefig(io.BytesIO())
 
-        assert file_no_autodraw.getvalue() != file_autodraw.getvalue()
+        assert len(draws) == 1
 
 
-def test_saved_figure_not_the_same_horizontal():
+@pytest.mark.parametrize("orientation", ("vertical", "horizontal"))
+def test_colorbar_no_predraw_required(orientation):
+    # the colorbar is positioned during the draw - a single draw is enough
 
     with figure_context() as f:
-        create_fig_aspect(aspect=2, orientation="horizontal")
+        aspect = 0.5 if orientation == "vertical" else 2
+        create_fig_aspect(aspect=aspect, orientation=orientation)
         # ensure the colorbar is actually on the figure
         f.subplots_adjust(bottom=0.5)
 
-        file_no_autodraw = io.BytesIO()
-        with mpu.autodraw(False):
-            f.savefig(file_no_autodraw)
+        file_no_predraw = io.BytesIO()
+        f.savefig(file_no_predraw)
 
-        file_autodraw = io.BytesIO()
-        with mpu.autodraw(True):
-            f.savefig(file_autodraw)
+        # as the former autodraw: draw before saving
+        file_predraw = io.BytesIO()
+        f.canvas.draw()
+        f.savefig(file_predraw)
 
-        assert file_no_autodraw.getvalue() != file_autodraw.getvalue()
+        assert file_no_predraw.getvalue() == file_predraw.getvalue()
@@ -247,6 +247,50 @@ def test_set_map_layout_cartopy_2_2():
         np.testing.assert_allclose(result, expected, rtol=get_rtol(f))
 
 
+def count_draws(f):
+
+    draws = []
+    f.canvas.mpl_connect("draw_event", draws.append)
+    return draws
+
+
+@pytest.mark.parametrize("extent", (None, (-20, 40, 30, 70)))
+@pytest.mark.parametrize("projection", ("PlateCarree", "Robinson", "Orthographic"))
+def test_set_map_layout_cartopy_no_draw(projection, extent):
+    import cartopy.crs as ccrs
+
+    subplot_kw = {"projection": getattr(ccrs, projection)()}
+    with subplots_context(subplot_kw=subplot_kw) as (f, ax):
+        f.subplots_adjust(top=1, bottom=0, left=0, right=1)
+
+        if extent is not None:
+            ax.set_extent(extent, ccrs.PlateCarree())
+
+        draws = count_draws(f)
+        set_map_layout(ax, width=17)
+
+        assert not draws
+
+        # same as the aspect after drawing the figure
+        f.canvas.draw()
+        result = f.get_size_inches() * 2.54
+        expected = (17, 17 * ax.get_data_ratio())
+
+        np.testing.assert_allclose(result, expected, rtol=get_rtol(f))
+
+
+def test_set_map_layout_datalim_draws():
+
+    with subplots_context() as (f, ax):
+        ax.set(xlim=(0, 2), ylim=(0, 1), aspect="equal", adjustable="datalim")
+
+        draws = count_draws(f)
+        set_map_layout(ax, width=17)
+
+        # the limits are adjusted on draw
+        assert len(draws) == 1
+
+
 @pytest.mark.skipif(plt.get_backend().lower() != "macosx", reason="only for macosx")
 @pytest.mark.parametrize("dpi", (100, 1000))
 @pytest.mark.parametrize("size", ([17, 6], [10, 5]))
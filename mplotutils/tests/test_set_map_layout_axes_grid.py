@@ -276,3 +276,25 @@ def test_set_map_layout_horz_not_enough_space(ncols, axes_pad):
 
         with pytest.raises(ValueError, match="Not enough space on figure"):
             set_map_layout(axgr, 10)
+
+
+def test_set_map_layout_cartopy_no_draw():
+    import cartopy.crs as ccrs
+    from cartopy.mpl.geoaxes import GeoAxes
+
+    with figure_context() as f:
+
+        axes_class = (GeoAxes, {"projection": ccrs.PlateCarree()})
+        axgr = AxesGrid(f, 111, nrows_ncols=(1, 1), axes_class=axes_class)
+
+        f.subplots_adjust(left=0, bottom=0, right=1, top=1)
+
+        draws = []
+        f.canvas.mpl_connect("draw_event", draws.append)
+
+        set_map_layout(axgr, 10)
+
+        assert not draws
+
+        width, height = f.get_size_inches() * 2.54
+        np.testing.assert_allclose((width, height), (10, 5), rtol=get_rtol(f))